@@ -0,0 +1,53 @@
+"""
+Benchmarks sorting, filtering and min/max of enum columns as ordered categoricals, against `object` columns.
+
+An `object` column of enum members is sorted and compared by Python comparisons, one pair of members at a time.
+"""
+
+import argparse
+from enum import auto
+
+import numpy as np
+import pandas as pd
+
+from context import report, timed
+
+from trintech.enum import DefinitionOrderedEnum
+from trintech.pandas.categorical import to_enum_categorical
+
+
+class Size(DefinitionOrderedEnum):
+    XS = auto()
+    S = auto()
+    M = auto()
+    L = auto()
+    XL = auto()
+
+
+OPERATIONS = {
+    'sort_values': lambda s: s.sort_values(),
+    'filter (> M)': lambda s: s[s > Size.M],
+    'min/max': lambda s: (s.min(), s.max()),
+    'groupby size': lambda s: s.groupby(s, observed=True).size(),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=10_000_000, help="The number of rows.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    members = np.array(list(Size), dtype=object)
+    objects = pd.Series(members[np.random.default_rng(args.seed).integers(len(members), size=args.n)])
+    seconds, categorical = timed(to_enum_categorical, objects, Size, repeat=1)
+    print(f'to_enum_categorical of {args.n:,} rows: {seconds:,.4f} s')
+    for name, operation in OPERATIONS.items():
+        rows = [
+            ('object', timed(operation, objects, repeat=1)[0]),
+            ('categorical', timed(operation, categorical, repeat=1)[0]),
+        ]
+        report(f'{name}: {args.n:,} rows', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmarks the memory and speed of `cross` and `generate_cross` against the former merge on a dummy key.
+
+The former `cross` renamed both frames, appended a constant key to each index and merged on it, copying both inputs
+several times. Its renaming of the columns of `b` (by the suffix of `a`) is fixed here, so that results are comparable.
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from context import peak_memory, report, timed
+
+from trintech.pandas.dataframe import cross, generate_cross
+
+
+def legacy_cross(a: pd.DataFrame, b: pd.DataFrame, suffixes=('_x', '_y')) -> pd.DataFrame:
+    a2 = a.rename(columns={c: c + suffixes[0] for c in a.columns})
+    b2 = b.rename(columns={c: c + suffixes[1] for c in b.columns})
+    key = 'key_0'
+    a2[key] = 0
+    b2[key] = 0
+    a2.set_index(key, drop=True, append=True, inplace=True)
+    b2.set_index(key, drop=True, append=True, inplace=True)
+    return pd.merge(a2, b2, on=key, suffixes=('', ''))
+
+
+def make_frame(n: int, prefix: str, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        f'{prefix}_int': rng.integers(0, 1000, size=n),
+        f'{prefix}_float': rng.random(n),
+        f'{prefix}_str': pd.Series(rng.integers(0, 100, size=n)).astype(str).to_numpy(dtype=object),
+    })
+
+
+def consume_chunks(a: pd.DataFrame, b: pd.DataFrame, chunk_size: int) -> int:
+    return sum(len(chunk) for chunk in generate_cross(a, b, chunk_size=chunk_size))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--a', type=int, default=10_000, help="The number of rows of the left frame.")
+    parser.add_argument('--b', type=int, default=1_000, help="The number of rows of the right frame.")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    a = make_frame(args.a, 'a', args.seed)
+    b = make_frame(args.b, 'b', args.seed + 1)
+    expected = legacy_cross(a, b)
+    assert (cross(a, b).to_numpy() == expected.to_numpy()).all()
+
+    product = f'{args.a:,} x {args.b:,} = {args.a * args.b:,} rows'
+    report(f'time: {product}', [
+        ('legacy merge on a dummy key', timed(legacy_cross, a, b, repeat=1)[0]),
+        ('cross', timed(cross, a, b, repeat=1)[0]),
+        (f'generate_cross (chunks of {args.chunk_size:,})', timed(consume_chunks, a, b, args.chunk_size, repeat=1)[0]),
+    ])
+    report(f'peak memory: {product}', [
+        ('legacy merge on a dummy key', peak_memory(legacy_cross, a, b)[0] / 2 ** 20),
+        ('cross', peak_memory(cross, a, b)[0] / 2 ** 20),
+        (f'generate_cross (chunks of {args.chunk_size:,})', peak_memory(consume_chunks, a, b, args.chunk_size)[0] / 2 ** 20),
+    ], unit='MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmarks the scaling of chunked `cross_apply`, serially and in thread and process pools, against the former groupby.
+
+The former `cross_apply` grouped by every index and column value and applied `func` to the first row of each group,
+via `groupby().apply` and `iterrows`. It is only run up to `--legacy-max` rows. Pools only help with more than one CPU,
+and `func` must be defined at module level to be pickled for processes. The default sizes take tens of minutes.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from context import report, timed
+
+from trintech.pandas.dataframe import cross_apply
+
+
+def explode(idx, row) -> pd.DataFrame:
+    """A typical `CROSS APPLY`: a few rows per input row, computed from it."""
+    n = int(row['n'])
+    return pd.DataFrame({'id': [row['id']] * n, 'k': range(n)})
+
+
+def legacy_cross_apply(df: pd.DataFrame, func) -> pd.DataFrame:
+    flat = df.reset_index()
+    index = list(flat.columns[:df.index.nlevels])
+    gb = flat.groupby([flat[c].to_numpy() for c in flat.columns], sort=False)
+    return gb.apply(lambda grp: func(*next(grp.set_index(index).iterrows())))
+
+
+def make_frame(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'id': np.arange(n), 'n': rng.integers(1, 4, size=n)})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy-max', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    with ThreadPoolExecutor(args.workers) as threads, ProcessPoolExecutor(args.workers) as processes:
+        for n in args.sizes:
+            df = make_frame(n, args.seed)
+            rows = []
+            if n <= args.legacy_max:
+                rows.append(('legacy groupby().apply', timed(legacy_cross_apply, df, explode, repeat=1)[0]))
+            seconds, expected = timed(cross_apply, df, explode, args.chunk_size, repeat=1)
+            rows.append(('chunked, serial', seconds))
+            for label, executor in ((f'chunked, {args.workers} threads', threads),
+                                    (f'chunked, {args.workers} processes', processes)):
+                seconds, result = timed(cross_apply, df, explode, args.chunk_size, executor, repeat=1)
+                assert result.equals(expected)
+                rows.append((label, seconds))
+            report(f'{n:,} rows', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmarks the `set_`, `unique` and `hyperloglog` groupby aggregations against the built-in `nunique` of Dask.
+
+The former `set_` and `unique` raised errors, so the exact built-in `SeriesGroupBy.nunique` is the baseline. A local,
+multi-partition data frame of `--n` rows in `--groups` groups is aggregated once per value cardinality, and the
+relative error of the HyperLogLog estimate against the exact counts is reported alongside.
+"""
+
+import argparse
+
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+
+from context import report, timed
+
+from trintech.dask.aggregations import hyperloglog, set_, unique
+
+
+def make_frame(n: int, groups: int, cardinality: int, npartitions: int, seed: int) -> dd.DataFrame:
+    rng = np.random.default_rng(seed)
+    pdf = pd.DataFrame({'g': rng.integers(0, groups, size=n), 'v': rng.integers(0, cardinality, size=n)})
+    return dd.from_pandas(pdf, npartitions=npartitions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=10_000_000)
+    parser.add_argument('--groups', type=int, default=100)
+    parser.add_argument('--cardinality', type=int, nargs='+', default=[1_000, 1_000_000],
+                        help="The numbers of possible distinct values.")
+    parser.add_argument('--npartitions', type=int, default=32)
+    parser.add_argument('--split-every', type=int, default=8)
+    parser.add_argument('--precision', type=int, default=12)
+    parser.add_argument('--scheduler', default='threads', choices=['sync', 'threads', 'processes'])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    for cardinality in args.cardinality:
+        df = make_frame(args.n, args.groups, cardinality, args.npartitions, args.seed)
+        grouped = df.groupby('g')['v']
+
+        def run(collection):
+            return collection.compute(scheduler=args.scheduler)
+
+        nunique_seconds, expected = timed(run, grouped.nunique(split_every=args.split_every), repeat=1)
+        set_seconds, sets = timed(run, grouped.agg(set_, split_every=args.split_every), repeat=1)
+        unique_seconds, lists = timed(run, grouped.agg(unique, split_every=args.split_every), repeat=1)
+        hll_seconds, estimates = timed(
+            run, grouped.agg(hyperloglog(args.precision), split_every=args.split_every), repeat=1)
+        assert sets.map(len).sort_index().equals(expected.sort_index())
+        assert lists.map(len).sort_index().equals(expected.sort_index())
+        error = ((estimates.sort_index() - expected.sort_index()).abs() / expected.sort_index()).max()
+        report(f'{args.n:,} rows, {args.npartitions} partitions, {args.groups:,} groups, '
+               f'{cardinality:,} possible values (max HyperLogLog error {error:.2%})', [
+            ('built-in nunique', nunique_seconds),
+            ('set_', set_seconds),
+            ('unique', unique_seconds),
+            (f'hyperloglog({args.precision})', hll_seconds),
+        ])
+
+
+if __name__ == '__main__':
+    main()
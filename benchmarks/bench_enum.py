@@ -0,0 +1,63 @@
+"""
+Benchmarks sorting `DefinitionOrderedEnum` members by precomputed ordinal, against the former per-comparison scan.
+
+The former implementation compared two members by scanning the enum class, as per
+`trintech.order.contains_strictly_ordered`, so every comparison was O(k) for k members.
+"""
+
+import argparse
+import random
+
+from context import report, timed
+
+from trintech.enum import DefinitionOrderedEnum, OrderedEnum
+from trintech.order import contains_strictly_ordered, contains_weakly_ordered
+
+
+class LegacyDefinitionOrderedEnum(OrderedEnum):
+    """`DefinitionOrderedEnum` as it was, before ordinals were precomputed."""
+    def __ge__(self, other):
+        if self.__class__ is other.__class__:
+            return contains_weakly_ordered(self.__class__, other, self)
+        return NotImplemented
+    def __gt__(self, other):
+        if self.__class__ is other.__class__:
+            return contains_strictly_ordered(self.__class__, other, self)
+        return NotImplemented
+    def __le__(self, other):
+        if self.__class__ is other.__class__:
+            return contains_weakly_ordered(self.__class__, self, other)
+        return NotImplemented
+    def __lt__(self, other):
+        if self.__class__ is other.__class__:
+            return contains_strictly_ordered(self.__class__, self, other)
+        return NotImplemented
+
+
+def make_enum(base: type, k: int) -> type:
+    return base(f'{base.__name__}{k}', [(f'M{i}', i) for i in range(k)])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=1_000_000, help="The number of members to sort.")
+    parser.add_argument('--k', type=int, nargs='+', default=[5, 50], help="The numbers of members per enum.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    for k in args.k:
+        rows = []
+        for label, base in (('legacy (scan per compare)', LegacyDefinitionOrderedEnum),
+                            ('ordinal', DefinitionOrderedEnum)):
+            enum_class = make_enum(base, k)
+            members = random.Random(args.seed).choices(list(enum_class), k=args.n)
+            seconds, result = timed(sorted, members, repeat=1)
+            assert [m.value for m in result] == sorted(m.value for m in members)
+            rows.append((label, seconds))
+            seconds, _ = timed(lambda: (min(members), max(members)), repeat=1)
+            rows.append((label, seconds))
+        report(f'sorted: {args.n:,} members of an enum of {k} members', rows[0::2])
+        report(f'min/max: {args.n:,} members of an enum of {k} members', rows[1::2])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmarks the memory and throughput of `FrozenQualifiedIdentifier` against `QualifiedIdentifier`.
+
+A catalog of column identifiers is built as if read from a file, so that equal parts are distinct strings unless
+interned. `QualifiedIdentifier` is not hashable by value, so it is keyed by its `to_tuple()`.
+"""
+
+import argparse
+import tracemalloc
+
+from context import report, timed
+
+from trintech.sql.tsql import FrozenQualifiedIdentifier, QualifiedIdentifier
+
+
+def make_parts(n: int) -> list:
+    # Parts are built per identifier (not shared), as when parsed from text.
+    return [('srv', f'db{i % 7}', f'schema{i % 31}', f'table{i // 50}', f'column{i % 50}') for i in range(n)]
+
+
+def build_legacy(parts: list) -> dict:
+    catalog = {}
+    for p in parts:
+        identifier = QualifiedIdentifier(*p)
+        catalog[identifier.to_tuple()] = identifier
+    return catalog
+
+
+def build_frozen(parts: list) -> dict:
+    catalog = {}
+    for p in parts:
+        identifier = FrozenQualifiedIdentifier(*p)
+        catalog[identifier] = identifier
+    return catalog
+
+
+def build_interned(parts: list) -> dict:
+    catalog = {}
+    for p in parts:
+        identifier = FrozenQualifiedIdentifier.intern(*p)
+        catalog[identifier] = identifier
+    return catalog
+
+
+def retained_memory(build, n: int) -> int:
+    """The bytes still allocated once the catalog is built and its raw parts released."""
+    tracemalloc.start()
+    try:
+        catalog = build(make_parts(n))
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+        del catalog
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=2_000_000, help="The number of column identifiers.")
+    args = parser.parse_args()
+    builders = [('QualifiedIdentifier (keyed by to_tuple)', build_legacy),
+                ('FrozenQualifiedIdentifier', build_frozen),
+                ('FrozenQualifiedIdentifier.intern', build_interned)]
+
+    rows = []
+    for label, build in builders:
+        FrozenQualifiedIdentifier.clear_interned()
+        rows.append((label, retained_memory(build, args.n) / 2 ** 20))
+    report(f'retained memory of the catalog: {args.n:,} identifiers', rows, unit='MiB')
+
+    parts = make_parts(args.n)
+    rows = []
+    catalogs = []
+    for label, build in builders:
+        FrozenQualifiedIdentifier.clear_interned()
+        seconds, catalog = timed(build, parts, repeat=1)
+        rows.append((label, seconds))
+        catalogs.append(catalog)
+    report(f'building the catalog: {args.n:,} identifiers', rows)
+
+    keys = [p for p in parts[::10]]
+    rows = [('QualifiedIdentifier (to_tuple keys)',
+             timed(lambda: [catalogs[0][QualifiedIdentifier(*k).to_tuple()] for k in keys])[0]),
+            ('FrozenQualifiedIdentifier',
+             timed(lambda: [catalogs[1][FrozenQualifiedIdentifier(*k)] for k in keys])[0])]
+    report(f'looking up: {len(keys):,} identifiers', rows)
+
+    legacy = list(catalogs[0].values())
+    frozen = list(catalogs[1].values())
+    rows = [('QualifiedIdentifier (by to_tuple)', timed(sorted, legacy, key=QualifiedIdentifier.to_tuple)[0]),
+            ('FrozenQualifiedIdentifier', timed(sorted, frozen)[0])]
+    report(f'sorting: {args.n:,} identifiers', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmarks reading lines of compressed files with `generate_decompressed_line_batches`, against naive readers.
+
+The naive baseline wraps the file by hand (e.g. `gzip.open`) and calls `readline` per line, so that decompression and
+processing alternate on a single thread. A per-line workload (`--work`) stands in for downstream parsing, which the
+background decompression of `generate_decompressed_line_batches` may overlap.
+"""
+
+import argparse
+import bz2
+import gzip
+import lzma
+import os
+import random
+import tempfile
+
+from context import report, timed
+
+from trintech.io import generate_decompressed_line_batches
+
+
+OPENERS = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+
+
+def write_file(path: str, compression: str, size: int, seed: int) -> None:
+    rng = random.Random(seed)
+    lines = [b'%d,%s,%f\n' % (i, b'x' * rng.randint(0, 200), rng.random()) for i in range(10_000)]
+    chunk = b''.join(lines)
+    with OPENERS[compression](path, 'wb') as f:
+        for _ in range(max(1, size // len(chunk))):
+            f.write(chunk)
+
+
+def process(line: bytes, work: int) -> int:
+    n = 0
+    for _ in range(work):
+        n += len(line.split(b','))
+    return n
+
+
+def read_naive(path: str, compression: str, work: int) -> int:
+    n = 0
+    with OPENERS[compression](path, 'rb') as f:
+        line = f.readline()
+        while line:
+            n += process(line, work) if work else 1
+            line = f.readline()
+    return n
+
+
+def read_pipelined(path: str, work: int, prefetch: int) -> int:
+    n = 0
+    with open(path, 'rb') as f:
+        for batch in generate_decompressed_line_batches(f, prefetch=prefetch):
+            if work:
+                n += sum(process(line, work) for line in batch)
+            else:
+                n += len(batch)
+    return n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=256, help="The uncompressed size of each file, in MiB.")
+    parser.add_argument('--compression', nargs='+', default=list(OPENERS), choices=list(OPENERS))
+    parser.add_argument('--work', type=int, nargs='+', default=[0, 2],
+                        help="The numbers of times to split each line, as a stand-in for parsing.")
+    parser.add_argument('--prefetch', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        for compression in args.compression:
+            path = os.path.join(directory, f'lines.{compression}')
+            write_file(path, compression, args.size_mb * 2 ** 20, args.seed)
+            for work in args.work:
+                naive_seconds, naive_count = timed(read_naive, path, compression, work, repeat=1)
+                seconds, count = timed(read_pipelined, path, work, args.prefetch, repeat=1)
+                assert count == naive_count, (count, naive_count)
+                report(f'{compression}, {args.size_mb:,} MiB uncompressed, work={work}', [
+                    (f'{OPENERS[compression].__module__}.open + readline', naive_seconds),
+                    ('generate_decompressed_line_batches', seconds),
+                ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmarks the throughput of the block, batch and memory-mapped line readers against `generate_lines`.
+
+A synthetic file of CSV-like lines of random lengths is written to a temporary directory (or `--path`) and read by
+each reader in turn. Every reader counts the same lines and bytes. The first read of a reader may be served from disk
+rather than the page cache, so the best of `--repeat` reads is reported.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+
+from context import report, timed
+
+from trintech.io import generate_line_batches, generate_lines, generate_mmap_lines, process_ranges
+
+
+def write_file(path: str, size: int, seed: int) -> None:
+    rng = random.Random(seed)
+    lines = [b'%d,%s,%f\n' % (i, b'x' * rng.randint(0, 200), rng.random()) for i in range(10_000)]
+    chunk = b''.join(lines)
+    with open(path, 'wb') as f:
+        for _ in range(max(1, size // len(chunk))):
+            f.write(chunk)
+
+
+def count_generate_lines(path: str, encoding: str) -> int:
+    with open(path, encoding=encoding, newline='') as f:
+        return sum(1 for _ in generate_lines(f))
+
+
+def count_generate_lines_binary(path: str) -> int:
+    with open(path, 'rb') as f:
+        return sum(1 for _ in generate_lines(f))
+
+
+def count_line_batches(path: str, encoding: str = None) -> int:
+    with open(path, 'rb') as f:
+        return sum(len(batch) for batch in generate_line_batches(f, encoding=encoding))
+
+
+def count_mmap_lines(path: str) -> int:
+    with open(path, 'rb') as f:
+        return sum(1 for _ in generate_mmap_lines(f))
+
+
+def count_process_ranges(path: str) -> int:
+    return sum(process_ranges(path, len, batches=True))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=1024, help="The size of the synthetic file, in MiB.")
+    parser.add_argument('--path', help="The path of an existing file to read instead of a synthetic file.")
+    parser.add_argument('--encoding', default='utf-8')
+    parser.add_argument('--repeat', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.path
+        if path is None:
+            path = os.path.join(directory, 'lines.csv')
+            write_file(path, args.size_mb * 2 ** 20, args.seed)
+        size = os.path.getsize(path)
+        readers = [
+            ('generate_lines (text)', lambda: count_generate_lines(path, args.encoding)),
+            ('generate_lines (binary)', lambda: count_generate_lines_binary(path)),
+            ('generate_line_batches (bytes)', lambda: count_line_batches(path)),
+            ('generate_line_batches (decoded)', lambda: count_line_batches(path, args.encoding)),
+            ('generate_mmap_lines (memoryview)', lambda: count_mmap_lines(path)),
+            ('process_ranges (batches, all CPUs)', lambda: count_process_ranges(path)),
+        ]
+        rows = []
+        counts = set()
+        for label, read in readers:
+            seconds, count = timed(read, repeat=args.repeat)
+            counts.add(count)
+            rows.append((label, size / 2 ** 20 / seconds))
+        assert len(counts) == 1, counts
+        report(f'{size / 2 ** 20:,.0f} MiB, {counts.pop():,} lines', rows, unit='MiB/s', higher_is_better=True)
+
+
+if __name__ == '__main__':
+    main()
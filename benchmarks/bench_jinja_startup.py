@@ -0,0 +1,105 @@
+"""
+Benchmarks the startup time of loading every template of a template package, with and without caching or precompiling.
+
+A temporary package of `--templates` SQL-generating templates is put on `sys.path`. Each measurement creates a fresh
+environment (as a new process would) and loads every template: parsing and compiling them from source, loading
+bytecode from a warm `create_bytecode_cache`, and loading the modules precompiled by `compile_templates` into a zip
+file or a directory.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+from context import report, timed
+
+from trintech.jinja.templating import compile_templates, create_bytecode_cache, create_environment
+
+
+PACKAGE = 'bench_jinja_startup_templates'
+
+TEMPLATE = """\
+{%- macro column_list(columns, alias) -%}
+{%- for column in columns %}
+    {{ alias }}.[{{ column.name }}]{% if column.cast %} = CAST({{ alias }}.[{{ column.name }}] AS {{ column.cast }}){% endif %}
+    {%- if not loop.last %},{% endif %}
+{%- endfor %}
+{%- endmacro -%}
+-- Template NUMBER
+{% for table in tables %}
+SELECT
+{{- column_list(table.columns, 'tNUMBER') }}
+FROM [{{ table.schema | default('dbo') }}].[{{ table.name }}] AS tNUMBER
+{%- if table.filters %}
+WHERE {% for name, value in table.filters.items() -%}
+    tNUMBER.[{{ name }}] = {{ value | string | replace("'", "''") | tojson }}{% if not loop.last %} AND {% endif %}
+{%- endfor %}
+{%- endif %}
+{%- if table.order_by %}
+ORDER BY {{ table.order_by | join(', ') }}
+{%- endif %};
+{% endfor %}
+"""
+
+CONTEXT = {'tables': [{
+    'name': f'table_{i}',
+    'columns': [{'name': f'column_{j}', 'cast': 'INT' if j % 2 else None} for j in range(5)],
+    'filters': {'id': i, 'code': f"x'{i}"},
+    'order_by': ['id'],
+} for i in range(3)]}
+
+
+def write_package(directory: str, n: int) -> str:
+    package = os.path.join(directory, PACKAGE)
+    os.makedirs(os.path.join(package, 'templates'))
+    os.makedirs(os.path.join(package, 'template'))
+    for path in (os.path.join(package, '__init__.py'), os.path.join(package, 'template', '__init__.py')):
+        open(path, 'w').close()
+    for number in range(n):
+        with open(os.path.join(package, 'templates', f'query_{number}.sql'), 'w') as f:
+            f.write(TEMPLATE.replace('NUMBER', str(number)))
+    return f'{PACKAGE}.template'
+
+
+def load_all(template_subpackage: str, names, **settings) -> list:
+    env = create_environment(template_subpackage, **settings)
+    return [env.get_template(name) for name in names]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--templates', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        template_subpackage = write_package(directory, args.templates)
+        sys.path.insert(0, directory)
+        names = [f'query_{number}.sql' for number in range(args.templates)]
+
+        cache_directory = os.path.join(directory, 'cache')
+        load_all(template_subpackage, names, bytecode_cache=create_bytecode_cache(cache_directory))
+        zip_path = os.path.join(directory, 'templates.zip')
+        compile_templates(template_subpackage, zip_path)
+        modules_directory = os.path.join(directory, 'modules')
+        compile_templates(template_subpackage, modules_directory, zip_=None)
+
+        settings = {
+            'parse and compile': {},
+            'warm bytecode cache': {'bytecode_cache': create_bytecode_cache(cache_directory)},
+            'precompiled zip': {'precompiled': zip_path},
+            'precompiled directory': {'precompiled': modules_directory},
+        }
+        rows = []
+        expected = None
+        for label, kwargs in settings.items():
+            seconds, templates = timed(load_all, template_subpackage, names, repeat=args.repeat, **kwargs)
+            rendered = [template.render(CONTEXT) for template in templates]
+            assert expected is None or rendered == expected
+            expected = rendered
+            rows.append((label, seconds))
+        report(f'creating an environment and loading {args.templates:,} templates', rows)
+
+
+if __name__ == '__main__':
+    main()
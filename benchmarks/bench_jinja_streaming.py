@@ -0,0 +1,68 @@
+"""
+Benchmarks the peak memory and time of `stream_to_file` against `Template.render`, for growing sizes of output.
+
+The template generates an `INSERT` script of `--sizes` MiB (approximately) from a constant context, and uses both
+`{% require %}` and `{% raise %}` as per `trintech.jinja.extensions`. Both renderers write to `os.devnull`. Peak memory
+is traced by `tracemalloc`, which slows rendering, so time is measured separately.
+"""
+
+import argparse
+import os
+
+from jinja2 import DictLoader, Environment
+
+from context import peak_memory, report, timed
+
+from trintech.jinja.extensions import RaiseExtension, RequireExtension
+from trintech.jinja.rendering import stream_to_file
+
+
+TEMPLATES = {
+    'header.sql': 'SET NOCOUNT ON;\n',
+    'row.sql': "{% require 'header.sql' %}"
+               "INSERT INTO [dbo].[{{ table }}] ([id], [name], [value]) VALUES ({{ i }}, 'name_{{ i }}', {{ i * 0.5 }});\n",
+    'script.sql': "{% require 'header.sql' %}"
+                  "{% if not table %}{% raise 'A table is required.' %}{% endif %}"
+                  "{% for i in range(n) %}{% include 'row.sql' %}{% endfor %}",
+}
+
+ROW_SIZE = 90
+"""The approximate number of characters per row of output."""
+
+
+def render_to_file(template, path: str, **kwargs) -> int:
+    with open(path, 'w') as f:
+        output = template.render(**kwargs)
+        f.write(output)
+        return len(output)
+
+
+def stream(template, path: str, **kwargs) -> int:
+    with open(path, 'w') as f:
+        return stream_to_file(template, f, **kwargs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100], help="The sizes of output, in MiB.")
+    args = parser.parse_args()
+    env = Environment(loader=DictLoader(TEMPLATES), extensions=[RequireExtension, RaiseExtension])
+    template = env.get_template('script.sql')
+    for size in args.sizes:
+        kwargs = {'table': 'values', 'n': size * 2 ** 20 // ROW_SIZE}
+        render_peak, render_chars = peak_memory(render_to_file, template, os.devnull, **kwargs)
+        stream_peak, stream_chars = peak_memory(stream, template, os.devnull, **kwargs)
+        assert render_chars == stream_chars, (render_chars, stream_chars)
+        title = f'{render_chars / 2 ** 20:,.1f} MiB of output'
+        report(f'peak memory: {title}', [
+            ('Template.render', render_peak / 2 ** 20),
+            ('stream_to_file', stream_peak / 2 ** 20),
+        ], unit='MiB')
+        report(f'time: {title}', [
+            ('Template.render', timed(render_to_file, template, os.devnull, repeat=1, **kwargs)[0]),
+            ('stream_to_file', timed(stream, template, os.devnull, repeat=1, **kwargs)[0]),
+        ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmarks parsing a synthetic corpus of T-SQL multi-part identifiers, one at a time and in bulk.
+
+There was no parser before `parse_identifier`, so a naive `str.split('.')` (which is wrong for quoted parts) is given
+as a lower bound. Names in logs repeat, which bulk parsing exploits by parsing each distinct name once.
+"""
+
+import argparse
+import random
+
+import pandas as pd
+
+from context import report, timed
+
+from trintech.sql.tsql import parse_identifier, parse_identifiers
+
+
+def make_names(n: int, n_distinct: int, seed: int) -> list:
+    rng = random.Random(seed)
+    forms = [
+        lambda i: f'dbo.table{i}',
+        lambda i: f'[db{i % 9}].[dbo].[table {i}]',
+        lambda i: f'[srv].[db].dbo.[weird]]name{i}]',
+        lambda i: f'sales."quoted ""table"" {i}"',
+        lambda i: f'table{i}',
+    ]
+    distinct = [rng.choice(forms)(i) for i in range(n_distinct)]
+    return [rng.choice(distinct) for _ in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=1_000_000, help="The number of names to parse.")
+    parser.add_argument('--distinct', type=float, nargs='+', default=[1.0, 0.01],
+                        help="The numbers of names from which to draw, relative to --n.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    for ratio in args.distinct:
+        n_distinct = max(1, int(args.n * ratio))
+        names = make_names(args.n, n_distinct, args.seed)
+        series = pd.Series(names)
+        assert parse_identifiers(names) == [parse_identifier(name) for name in names]
+        rows = [('naive str.split (lower bound)', timed(lambda: [name.split('.') for name in names], repeat=1)[0]),
+                ('parse_identifier per name', timed(lambda: [parse_identifier(name) for name in names], repeat=1)[0]),
+                ('parse_identifiers list', timed(parse_identifiers, names, repeat=1)[0]),
+                ('parse_identifiers Series', timed(parse_identifiers, series, repeat=1)[0])]
+        report(f'{args.n:,} names drawn from {n_distinct:,}', rows, baseline=rows[1][1])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmarks batched T-SQL quoting against quoting one value per call.
+
+The former `quote_string` and `quote_identifier` went through the generic `trintech.string.quote` once per value, as
+does the legacy baseline here.
+"""
+
+import argparse
+import io
+import random
+import string
+
+import pandas as pd
+
+from context import report, timed
+
+from trintech.sql.tsql import (quote_identifier, quote_identifiers, quote_string, quote_strings,
+                               write_quoted_strings)
+from trintech.string import quote
+
+
+def legacy_quote_string(s: str) -> str:
+    return quote(s, '\'', escape=None)
+
+
+def legacy_quote_identifier(s: str) -> str:
+    return quote(s, lquote='[', rquote=']', escape=None)
+
+
+def make_strings(n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + "  '[]"
+    return [''.join(rng.choices(alphabet, k=rng.randint(1, 30))) for _ in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=1_000_000, help="The number of strings to quote.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    strings = make_strings(args.n, args.seed)
+    series = pd.Series(strings)
+
+    expected = [legacy_quote_string(s) for s in strings]
+    rows = [('legacy per call (trintech.string.quote)', timed(lambda: [legacy_quote_string(s) for s in strings])[0]),
+            ('per call (quote_string)', timed(lambda: [quote_string(s) for s in strings])[0]),
+            ('batched list (quote_strings)', timed(quote_strings, strings)[0]),
+            ('batched Series (quote_strings)', timed(quote_strings, series)[0])]
+    assert quote_strings(strings) == expected and quote_strings(series).tolist() == expected
+    report(f'string literals: {args.n:,} values', rows)
+
+    rows = [('legacy per call (trintech.string.quote)',
+             timed(lambda: [legacy_quote_identifier(s) for s in strings])[0]),
+            ('per call (quote_identifier)', timed(lambda: [quote_identifier(s) for s in strings])[0]),
+            ('batched list (quote_identifiers)', timed(quote_identifiers, strings)[0]),
+            ('batched Series (quote_identifiers)', timed(quote_identifiers, series)[0])]
+    report(f'identifiers: {args.n:,} values', rows)
+
+    def write_per_call():
+        f = io.StringIO()
+        f.write(', '.join(legacy_quote_string(s) for s in strings))
+        return f.getvalue()
+
+    def write_batched():
+        f = io.StringIO()
+        write_quoted_strings(iter(strings), f)
+        return f.getvalue()
+
+    assert write_per_call() == write_batched()
+    rows = [('legacy per call, joined', timed(write_per_call)[0]),
+            ('write_quoted_strings (lazy input)', timed(write_batched)[0])]
+    report(f'writing string literals to a buffer: {args.n:,} values', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Provides an installation-agnostic import context, and timing helpers, for benchmarks.
+
+Benchmarks are standalone scripts, run one at a time from the project root, e.g.::
+
+    python benchmarks/bench_enum.py --n 100000
+
+They are not collected by `pytest` (see `testpaths` in "setup.cfg"). Each script imports this module first::
+
+    from context import report, timed
+
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+
+def timed(func: Callable[..., Any], *args: Any, repeat: int = 3, **kwargs: Any) -> Tuple[float, Any]:
+    """The best elapsed seconds of `repeat` calls of `func`, and the result of the last call."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[int, Any]:
+    """The peak bytes allocated (as traced by `tracemalloc`) during a call of `func`, and its result."""
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+def report(
+        title: str,
+        rows: List[Tuple[str, float]],
+        unit: str = 's',
+        baseline: Optional[float] = None,
+        higher_is_better: bool = False,
+) -> None:
+    """Prints a table of measurements, each relative to `baseline` (default: the first), as a speedup or saving."""
+    print(title)
+    if not rows:
+        return
+    if baseline is None:
+        baseline = rows[0][1]
+    width = max(len(label) for label, _ in rows)
+    for label, value in rows:
+        if higher_is_better:
+            ratio = f'{value / baseline:8.2f}x' if baseline else '       -'
+        else:
+            ratio = f'{baseline / value:8.2f}x' if value else '       -'
+        print(f'  {label:<{width}}  {value:14,.4f} {unit}  {ratio}')
@@ -1,19 +1,226 @@
+"""Custom `dask.dataframe` groupby aggregations.
 
+Tests:
+    >>> df = dd.from_pandas(pd.DataFrame({'g': [1, 1, 2, 1], 'v': [1, 2, 3, 1]}), npartitions=3)
+    >>> df.groupby('g')['v'].agg(set_, split_every=2).compute(scheduler='sync').to_dict()
+    {1: frozenset({1, 2}), 2: frozenset({3})}
+    >>> df.groupby('g')['v'].agg(unique).compute(scheduler='sync').map(sorted).to_dict()
+    {1: [1, 2], 2: [3]}
+
+"""
+
+
+from typing import Any, Iterable, Optional
 
 import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+
+from trintech.pandas.aggregations import PROFILE_COLUMNS, min_max
+
+
+def _union(sets: pd.core.groupby.SeriesGroupBy) -> pd.Series:
+    return sets.agg(lambda sets_: frozenset().union(*sets_))
+
+
+set_ = dd.Aggregation(
+    'set_',
+    lambda series: series.agg(lambda values: frozenset(values.dropna())),
+    _union,
+)
+"""The set of the distinct non-null values of each group.
+
+Partial sets are unioned in a tree (as per `split_every`), rather than all on
+a single worker.
+"""
 
 
-# FIXME: This results in errors.
 unique = dd.Aggregation(
     'unique',
-    lambda series: series.unique(),
-    lambda series: series.unique(),
+    set_.chunk,
+    set_.agg,
+    lambda sets: sets.map(list),
 )
+"""The list of the distinct non-null values of each group, in no particular order.
 
+See `set_`.
+"""
 
-# FIXME: This results in errors.
-set_ = dd.Aggregation(
-    'set_',
-    lambda series: set(series.unique()),
-    lambda sets: set.intersection(sets)
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    # `np.frexp` is exact for integers of at most 53 bits, so split into halves.
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1])
+
+
+def _hyperloglog_sketch(values: pd.Series, precision: int) -> np.ndarray:
+    hashes = pd.util.hash_pandas_object(values.dropna(), index=False).to_numpy()
+    n_bits = 64 - precision
+    buckets = (hashes >> np.uint64(n_bits)).astype(np.intp)
+    ranks = n_bits + 1 - _bit_length(hashes & np.uint64((1 << n_bits) - 1))
+    registers = np.zeros(1 << precision, dtype=np.uint8)
+    np.maximum.at(registers, buckets, ranks.astype(np.uint8))
+    return registers
+
+
+def _hyperloglog_estimate(registers: np.ndarray) -> float:
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+    n_zeros = np.count_nonzero(registers == 0)
+    if estimate <= 2.5 * m and n_zeros:  # small range correction
+        estimate = m * np.log(m / n_zeros)
+    return float(estimate)
+
+
+def hyperloglog(precision: int=12) -> dd.Aggregation:
+    """An approximate count of the distinct non-null values of each group.
+
+    Each partition is reduced to a HyperLogLog sketch of `2 ** precision` one-byte
+    registers per group, and sketches are merged in a tree (as per
+    `split_every`), so memory is bounded regardless of cardinality. The relative
+    standard error is about `1.04 / sqrt(2 ** precision)`, i.e. about 1.6% for
+    the default precision.
+
+    Args:
+        precision (int): The number of hash bits with which to select a
+            register. Within `[4, 18]`.
+
+    Returns:
+        dd.Aggregation: The aggregation.
+
+    Tests:
+        >>> df = dd.from_pandas(pd.DataFrame({'g': [1, 2] * 5000, 'v': range(10_000)}), npartitions=4)
+        >>> counts = df.groupby('g')['v'].agg(hyperloglog()).compute(scheduler='sync')
+        >>> bool(((counts - 5000).abs() < 250).all())
+        True
+
+    """
+    if not 4 <= precision <= 18:
+        raise ValueError("The precision must be within [4, 18].")
+    return dd.Aggregation(
+        f'hyperloglog_{precision}',
+        lambda series: series.apply(lambda values: _hyperloglog_sketch(values, precision)),
+        lambda sketches: sketches.apply(lambda sketches_: np.maximum.reduce(list(sketches_))),
+        lambda sketches: sketches.map(_hyperloglog_estimate),
+    )
+
+
+approx_nunique = hyperloglog()
+
+
+count_na = dd.Aggregation(
+    'count_na',
+    lambda series: (series.size(), series.count()),
+    lambda sizes, counts: (sizes.sum(), counts.sum()),
+    lambda sizes, counts: sizes - counts,
 )
+"""The number of null values of each group, as per `trintech.pandas.aggregations.count_na`."""
+
+
+count_null = count_na  # alias
+
+
+def _extremum(values: Iterable[Any], maximum: bool) -> Any:
+    values = pd.Series(list(values), dtype=object).dropna()
+    if values.empty:
+        return np.nan
+    min_, max_ = min_max(values)
+    return max_ if maximum else min_
+
+
+def _profile_chunk(df: pd.DataFrame, exact: bool, precision: int) -> pd.DataFrame:
+    columns = [df.iloc[:, i] for i in range(df.shape[1])]
+    min_maxes = [min_max(column) for column in columns]
+    if exact:
+        distincts = [frozenset(column.dropna()) for column in columns]
+    else:
+        distincts = [_hyperloglog_sketch(column, precision) for column in columns]
+    return pd.DataFrame({
+        'size': [len(df)] * df.shape[1],
+        'count': df.count().to_numpy(),
+        'min': pd.Series([min_ for min_, _ in min_maxes], dtype=object).to_numpy(),
+        'max': pd.Series([max_ for _, max_ in min_maxes], dtype=object).to_numpy(),
+        'memory_usage': df.memory_usage(index=False, deep=True).to_numpy(),
+        'distinct': pd.Series(distincts, dtype=object).to_numpy(),
+    }, index=df.columns)
+
+
+def _profile_combine(partials: pd.DataFrame, exact: bool) -> pd.DataFrame:
+    grouped = partials.groupby(level=0, sort=False)
+    merge = (lambda sets: frozenset().union(*sets)) if exact else (lambda sketches: np.maximum.reduce(list(sketches)))
+    return pd.DataFrame({
+        'size': grouped['size'].sum(),
+        'count': grouped['count'].sum(),
+        'min': grouped['min'].apply(lambda values: _extremum(values, maximum=False)).astype(object),
+        'max': grouped['max'].apply(lambda values: _extremum(values, maximum=True)).astype(object),
+        'memory_usage': grouped['memory_usage'].sum(),
+        'distinct': grouped['distinct'].apply(merge).astype(object),
+    })
+
+
+def _profile_aggregate(partials: pd.DataFrame, exact: bool) -> pd.DataFrame:
+    combined = _profile_combine(partials, exact)
+    estimate = len if exact else _hyperloglog_estimate
+    return pd.DataFrame({
+        'count': combined['count'],
+        'null_count': combined['size'] - combined['count'],
+        'distinct_count': combined['distinct'].map(estimate),
+        'min': combined['min'],
+        'max': combined['max'],
+        'memory_usage': combined['memory_usage'],
+    }, columns=PROFILE_COLUMNS)
+
+
+def profile(
+        df: dd.DataFrame,
+        exact: bool=False,
+        precision: int=12,
+        split_every: Optional[int]=None,
+) -> dd.DataFrame:
+    """Profiles every column of a data frame within a single scan.
+
+    The counterpart of `trintech.pandas.aggregations.profile`. Each partition is
+    profiled once, and the partial profiles are combined in a tree (as per
+    `split_every`).
+
+    Args:
+        df (dd.DataFrame): The data frame to profile.
+        exact (bool): Whether to count distinct values exactly, via sets as per
+            `set_`, rather than approximately, via sketches as per `hyperloglog`.
+        precision (int): See `hyperloglog`.
+        split_every (Optional[int]): The number of partial profiles to combine
+            at a time.
+
+    Returns:
+        dd.DataFrame: The lazy, single-partition profile, as per
+            `trintech.pandas.aggregations.profile`.
+
+    Tests:
+        >>> pdf = pd.DataFrame({'a': [1, None, 1, 3], 'b': ['x', 'y', None, 'x']})
+        >>> df = dd.from_pandas(pdf, npartitions=3)
+        >>> profile(df, exact=True, split_every=2).compute(scheduler='sync')  # doctest: +ELLIPSIS
+           count  null_count  distinct_count  min  max  memory_usage
+        a      3           1               2  1.0  3.0            32
+        b      3           1               2    x    y           ...
+
+    """
+    meta = pd.DataFrame({
+        'count': pd.Series(dtype='int64'),
+        'null_count': pd.Series(dtype='int64'),
+        'distinct_count': pd.Series(dtype='int64' if exact else 'float64'),
+        'min': pd.Series(dtype=object),
+        'max': pd.Series(dtype=object),
+        'memory_usage': pd.Series(dtype='int64'),
+    })
+    return df.reduction(
+        _profile_chunk,
+        aggregate=_profile_aggregate,
+        combine=_profile_combine,
+        meta=meta,
+        split_every=split_every,
+        chunk_kwargs={'exact': exact, 'precision': precision},
+        aggregate_kwargs={'exact': exact},
+        combine_kwargs={'exact': exact},
+    )
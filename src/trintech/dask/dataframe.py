@@ -0,0 +1,74 @@
+from typing import Any, Callable, Optional, Tuple, Union
+
+import dask.dataframe as dd
+import pandas as pd
+
+from trintech.pandas import dataframe as pdf
+from trintech.pandas.dataframe import CROSS_APPLY_CHUNK_SIZE, row_to_frame
+
+
+def cross(
+        a: dd.DataFrame,
+        b: Union[pd.DataFrame, dd.DataFrame],
+        suffixes: Tuple[str, str]=('_x', '_y'),
+) -> dd.DataFrame:
+    """Equivalent to `CROSS JOIN` in T-SQL, as per `trintech.pandas.dataframe.cross`.
+
+    `b` is assumed to be the small side: it is computed (if need be) and
+    broadcast to every partition of `a`, which is crossed with it partition-wise.
+
+    Args:
+        a (dd.DataFrame): The left (large) data frame.
+        b (Union[pd.DataFrame, dd.DataFrame]): The right (small) data frame.
+        suffixes (Tuple[str, str]): See `trintech.pandas.dataframe.cross`.
+
+    Returns:
+        dd.DataFrame: Each row of `a` paired with each row of `b`, partitioned as
+            `a`. The index restarts at zero within each partition.
+
+    Examples:
+        >>> a = dd.from_pandas(pd.DataFrame({'n': [1, 2, 3]}), npartitions=2)
+        >>> b = pd.DataFrame({'n': ['x', 'y']})
+        >>> cross(a, b).compute(scheduler='sync').values.tolist()
+        [[1, 'x'], [1, 'y'], [2, 'x'], [2, 'y'], [3, 'x'], [3, 'y']]
+
+    """
+    if isinstance(b, dd.DataFrame):
+        b = b.compute()
+    meta = pdf.cross(a._meta, b.iloc[:0], suffixes)
+    return a.map_partitions(pdf.cross, b, suffixes, meta=meta, align_dataframes=False).clear_divisions()
+
+
+def cross_apply(
+        df: dd.DataFrame,
+        func: Callable[[Any, pd.Series], pd.DataFrame]=row_to_frame,
+        chunk_size: int=CROSS_APPLY_CHUNK_SIZE,
+        meta: Optional[Any]=None,
+) -> dd.DataFrame:
+    """Equivalent to `CROSS APPLY` in T-SQL, as per `trintech.pandas.dataframe.cross_apply`.
+
+    Applied partition-wise, so that each partition is processed by its own task.
+
+    Args:
+        df (dd.DataFrame): The data frame to which to apply `func`.
+        func (Callable[[Any, pd.Series], pd.DataFrame]): See
+            `trintech.pandas.dataframe.cross_apply`.
+        chunk_size (int): See `trintech.pandas.dataframe.cross_apply`.
+        meta (Optional[Any]): The empty data frame with the columns and dtypes
+            of the result. If `None`, then the same as `df`, as is the case for
+            the default `func`.
+
+    Returns:
+        dd.DataFrame: The concatenation of the results of `func`, partitioned as
+            `df`.
+
+    Examples:
+        >>> df = dd.from_pandas(pd.DataFrame({'n': [1, 2]}), npartitions=2)
+        >>> twice = lambda idx, row: pd.DataFrame({'n': [row['n']] * 2})
+        >>> cross_apply(df, twice).compute(scheduler='sync')['n'].tolist()
+        [1, 1, 2, 2]
+
+    """
+    if meta is None:
+        meta = df._meta
+    return df.map_partitions(pdf.cross_apply, func, chunk_size, meta=meta).clear_divisions()
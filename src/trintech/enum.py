@@ -1,7 +1,6 @@
 
 
-from enum import Enum
-from trintech.order import contains_weakly_ordered, contains_strictly_ordered
+from enum import Enum, EnumMeta
 
 
 class OrderedEnum(Enum):
@@ -44,7 +43,21 @@ class OrderedEnum(Enum):
         return NotImplemented
 
 
-class DefinitionOrderedEnum(OrderedEnum):
+class DefinitionOrderedEnumMeta(EnumMeta):
+    """The metaclass of `DefinitionOrderedEnum`.
+
+    Records the definition order of each member as its ordinal once, at class
+    creation, so that comparisons need not rescan the enum.
+
+    """
+    def __new__(metacls, cls, bases, classdict, **kwargs):
+        enum_class = super().__new__(metacls, cls, bases, classdict, **kwargs)
+        for ordinal, member in enumerate(enum_class):
+            member._ordinal = ordinal
+        return enum_class
+
+
+class DefinitionOrderedEnum(OrderedEnum, metaclass=DefinitionOrderedEnumMeta):
     """An ordered enum whose names are ordered by their definition order.
 
     Tests:
@@ -76,21 +89,32 @@ class DefinitionOrderedEnum(OrderedEnum):
         ['A', 'B', 'C']
         >>> print(sorted(list(abc.name for abc in ABC)))
         ['A', 'B', 'C']
+        >>> class CBA(DefinitionOrderedEnum):
+        ...     C = 1
+        ...     B = 2
+        ...     A = 3
+        ...     Z = 1
+        >>> sorted([CBA.A, CBA.C, CBA.B])
+        [<CBA.C: 1>, <CBA.B: 2>, <CBA.A: 3>]
+        >>> min(CBA), max(CBA)
+        (<CBA.C: 1>, <CBA.A: 3>)
+        >>> CBA.Z <= CBA.C
+        True
 
     """
     def __ge__(self, other):
         if self.__class__ is other.__class__:
-            return contains_weakly_ordered(self.__class__, other, self)
+            return self._ordinal >= other._ordinal
         return NotImplemented
     def __gt__(self, other):
         if self.__class__ is other.__class__:
-            return contains_strictly_ordered(self.__class__, other, self)
+            return self._ordinal > other._ordinal
         return NotImplemented
     def __le__(self, other):
         if self.__class__ is other.__class__:
-            return contains_weakly_ordered(self.__class__, self, other)
+            return self._ordinal <= other._ordinal
         return NotImplemented
     def __lt__(self, other):
         if self.__class__ is other.__class__:
-            return contains_strictly_ordered(self.__class__, self, other)
+            return self._ordinal < other._ordinal
         return NotImplemented
@@ -1,9 +1,35 @@
-#description
+"""Utilities for reading files."""
 
 
-# imports
+import asyncio
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import queue
+import random
+import threading
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, as_completed, wait
+from itertools import accumulate, chain
+from typing import (Any, AnyStr, AsyncIterator, BinaryIO, Callable, IO, Iterator, List, Optional, Tuple,
+                    Union)
 
 
+DEFAULT_BLOCK_SIZE = 1_048_576  # 1 MiB
+DEFAULT_RANGE_SIZE = 16_777_216  # 16 MiB
+LINE_INDEX_SUFFIX = '.lineidx'
+
+MAGIC_NUMBERS = {
+    'gzip': b'\x1f\x8b',
+    'bz2': b'BZh',
+    'xz': b'\xfd7zXZ\x00',
+    'zstd': b'\x28\xb5\x2f\xfd',
+}
+
 
 def generate_lines(f: io.FileIO, max_bytes: int = 1_073_741_824) -> Iterator[str]:
     """
@@ -21,3 +47,738 @@ def generate_lines(f: io.FileIO, max_bytes: int = 1_073_741_824) -> Iterator[str
     while line:
         yield line
         line = f.readline(max_bytes)
+
+
+def generate_blocks(
+        f: BinaryIO,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        limit: Optional[int] = None,
+) -> Iterator[Tuple[int, bytes]]:
+    """
+    Lazily generates blocks of whole lines from a binary file.
+
+    Each block ends at a line feed (`b'\\n'`), except possibly the last. A block is larger than `block_size` only if
+    it consists of a single line that is.
+
+    :param f:
+        The opened binary file from which to generate blocks. Read from its current position.
+    :param block_size:
+        The number of bytes to read at a time. Default value is 1 MiB.
+    :param limit:
+        If non-null, then the maximum number of bytes to read from `f`.
+    :return:
+        A lazy iterator over pairs of the byte offset of a block (relative to the starting position of `f`) and the
+        block itself.
+
+    >>> f = io.BytesIO(b'a\\nbb\\nccc\\n')
+    >>> list(generate_blocks(f, block_size=4))
+    [(0, b'a\\n'), (2, b'bb\\n'), (5, b'ccc\\n')]
+    """
+    offset = 0
+    tail = b''
+    remaining = limit
+    while True:
+        if remaining is not None:
+            data = f.read(min(block_size, remaining))
+            remaining -= len(data)
+        else:
+            data = f.read(block_size)
+        if not data:
+            break
+        data = tail + data if tail else data
+        end = data.rfind(b'\n') + 1
+        if end == 0:  # no whole line yet
+            tail = data
+            continue
+        yield offset, data[:end]
+        offset += end
+        tail = data[end:]
+    if tail:
+        yield offset, tail
+
+
+def _split_lines(block: AnyStr) -> List[AnyStr]:
+    # Split on line feeds only, as do `generate_lines` and `generate_blocks`, unlike `splitlines`. But `splitlines` is
+    # much faster, so use it whenever it splits on line feeds only, i.e. into as many lines as there are line feeds
+    # (and an unterminated last line), e.g. if every carriage return is of a CRLF.
+    if isinstance(block, bytes):
+        if b'\r' not in block:
+            return block.splitlines(keepends=True)
+        newline = b'\n'
+    else:
+        newline = '\n'
+    lines = block.splitlines(keepends=True)
+    if len(lines) == block.count(newline) + (not block.endswith(newline)):
+        return lines
+    lines = [line + newline for line in block.split(newline)]
+    last = lines.pop()[:-1]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def generate_line_batches(
+        f: BinaryIO,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        encoding: Optional[str] = None,
+        offsets: bool = False,
+        limit: Optional[int] = None,
+) -> Iterator[List[Union[bytes, str, Tuple[int, Union[bytes, str]]]]]:
+    """
+    Lazily generates batches of lines from a binary file, one batch per block read.
+
+    Much faster than `generate_lines` for large files, since lines are split from large blocks in bulk rather than
+    read one at a time. Lines keep their line terminators, and are split on line feeds (`b'\\n'`) only, as by
+    `generate_lines`.
+
+    :param f:
+        The opened binary file from which to generate lines.
+    :param block_size:
+        The number of bytes to read at a time. Default value is 1 MiB.
+    :param encoding:
+        If non-null, then the encoding with which to decode each line into a `str`. Otherwise, lines are `bytes`.
+    :param offsets:
+        Whether to generate each line as a pair of its byte offset (relative to the starting position of `f`) and the
+        line itself.
+    :param limit:
+        If non-null, then the maximum number of bytes to read from `f`.
+    :return:
+        A lazy iterator over lists of lines in the file.
+
+    >>> f = io.BytesIO(b'a\\r\\nbb\\nccc')
+    >>> list(generate_line_batches(f, block_size=5, encoding='utf-8', offsets=True))
+    [[(0, 'a\\r\\n')], [(3, 'bb\\n')], [(6, 'ccc')]]
+    >>> list(generate_line_batches(io.BytesIO(b'a\\rb\\x0cc\\n')))
+    [[b'a\\rb\\x0cc\\n']]
+    >>> list(generate_line_batches(io.BytesIO(b'a\\r\\nb\\rc\\r\\n'))), list(generate_line_batches(io.BytesIO(b'a\\r\\nb\\r\\n')))
+    ([[b'a\\r\\n', b'b\\rc\\r\\n']], [[b'a\\r\\n', b'b\\r\\n']])
+    """
+    for offset, block in generate_blocks(f, block_size, limit):
+        lines = _split_lines(block)
+        if encoding is not None:
+            decoded = [line.decode(encoding) for line in lines]
+        else:
+            decoded = lines
+        if offsets:
+            starts = accumulate((len(line) for line in lines), initial=offset)
+            yield list(zip(starts, decoded))
+        else:
+            yield decoded
+
+
+def detect_compression(f: BinaryIO) -> Optional[str]:
+    """
+    Detects the compression format of a binary file by its magic number, without consuming it.
+
+    :param f:
+        The opened binary file. Must either be seekable or support `peek` (as does `io.BufferedReader`, e.g. a pipe
+        opened by `open`).
+    :return:
+        The key within `MAGIC_NUMBERS` of the compression format, or `None` if uncompressed (or unrecognized).
+
+    >>> detect_compression(io.BytesIO(gzip.compress(b'text')))
+    'gzip'
+    >>> detect_compression(io.BytesIO(b'text')) is None
+    True
+    """
+    n = max(len(magic) for magic in MAGIC_NUMBERS.values())
+    if hasattr(f, 'peek'):
+        head = f.peek(n)[:n]
+    else:
+        position = f.tell()
+        head = f.read(n)
+        f.seek(position)
+    for compression, magic in MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_decompressed(f: BinaryIO) -> BinaryIO:
+    """
+    Wraps a binary file with the decompressor of its compression format, as detected by `detect_compression`.
+
+    The `zstd` format requires the optional `zstandard` package.
+
+    :param f:
+        The opened binary file.
+    :return:
+        A binary file from which to read the decompressed contents of `f`, or `f` itself if uncompressed.
+    """
+    compression = detect_compression(f)
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=f, mode='rb')
+    if compression == 'bz2':
+        return bz2.BZ2File(f, mode='rb')
+    if compression == 'xz':
+        return lzma.LZMAFile(f, mode='rb')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("Reading a zstd-compressed file requires the 'zstandard' package.") from e
+        return zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+    return f
+
+
+def generate_prefetched_blocks(
+        f: BinaryIO,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        prefetch: int = 4,
+) -> Iterator[bytes]:
+    """
+    Lazily generates blocks read from a file by a background thread.
+
+    Reading (including any decompression, which releases the GIL) overlaps with the processing of previously read
+    blocks, up to `prefetch` blocks ahead.
+
+    :param f:
+        The opened binary file from which to read. Must not be read by anything else until this is exhausted or closed.
+    :param block_size:
+        The number of bytes to read at a time. Default value is 1 MiB.
+    :param prefetch:
+        The maximum number of blocks to read ahead of consumption.
+    :return:
+        A lazy iterator over blocks of at most `block_size` bytes (not aligned to lines).
+    """
+    blocks = queue.Queue(maxsize=prefetch)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                blocks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def read() -> None:
+        try:
+            data = f.read(block_size)
+            while data and put(data):
+                data = f.read(block_size)
+            put(b'')
+        except BaseException as e:
+            put(e)
+
+    reader = threading.Thread(target=read, name='generate_prefetched_blocks', daemon=True)
+    reader.start()
+    try:
+        while True:
+            data = blocks.get()
+            if isinstance(data, BaseException):
+                raise data
+            if not data:
+                break
+            yield data
+    finally:
+        stopped.set()
+        reader.join()
+
+
+class _BlockReader:
+    """A minimal file whose `read` returns the next of the given blocks, regardless of the size requested."""
+
+    def __init__(self, blocks: Iterator[bytes]):
+        self._blocks = blocks
+
+    def read(self, size: int = -1) -> bytes:
+        return next(self._blocks, b'')
+
+
+def generate_decompressed_line_batches(
+        f: BinaryIO,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        encoding: Optional[str] = None,
+        prefetch: int = 4,
+) -> Iterator[List[Union[bytes, str]]]:
+    """
+    Lazily generates batches of lines from a possibly compressed binary file.
+
+    The compression format is detected by `detect_compression`, and decompression runs in a background thread (see
+    `generate_prefetched_blocks`), so that it overlaps with the processing of lines. Otherwise equivalent to
+    `generate_line_batches` (without offsets).
+
+    :param f:
+        The opened binary file from which to generate lines.
+    :param block_size:
+        The number of (decompressed) bytes to read at a time. Default value is 1 MiB.
+    :param encoding:
+        If non-null, then the encoding with which to decode each line into a `str`. Otherwise, lines are `bytes`.
+    :param prefetch:
+        The maximum number of blocks to decompress ahead of consumption.
+    :return:
+        A lazy iterator over lists of lines in the decompressed file.
+
+    >>> f = io.BytesIO(lzma.compress(b'a\\nb\\nc\\n'))
+    >>> list(generate_decompressed_line_batches(f, block_size=3))
+    [[b'a\\n'], [b'b\\n', b'c\\n']]
+    """
+    blocks = generate_prefetched_blocks(open_decompressed(f), block_size, prefetch)
+    try:
+        yield from generate_line_batches(_BlockReader(blocks), block_size, encoding)
+    finally:
+        blocks.close()
+
+
+async def agenerate_blocks(
+        f: Union[IO[AnyStr], asyncio.StreamReader],
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        executor: Optional[Executor] = None,
+) -> AsyncIterator[AnyStr]:
+    """
+    Asynchronously generates blocks of whole lines from a file or stream, without blocking the event loop.
+
+    The asynchronous counterpart of `generate_blocks` (without offsets). An `asyncio.StreamReader` (e.g. the `stdout`
+    of an `asyncio` subprocess) is read directly; any other file is read within `executor`. The next block is read
+    only once the previous one has been consumed, so a slow consumer applies backpressure.
+
+    :param f:
+        The opened file (binary or text) or stream from which to generate blocks.
+    :param block_size:
+        The number of bytes (or characters) to read at a time. Default value is 1 MiB.
+    :param executor:
+        The executor within which to read a file. Default value is the event loop's default executor.
+    :return:
+        A lazy asynchronous iterator over blocks of whole lines.
+    """
+    if isinstance(f, asyncio.StreamReader):
+        read = f.read
+    else:
+        loop = asyncio.get_running_loop()
+        read = lambda n: loop.run_in_executor(executor, f.read, n)
+    tail = None
+    while True:
+        data = await read(block_size)
+        if not data:
+            break
+        data = tail + data if tail else data
+        end = data.rfind(b'\n' if isinstance(data, bytes) else '\n') + 1
+        if end == 0:  # no whole line yet
+            tail = data
+            continue
+        yield data[:end]
+        tail = data[end:]
+    if tail:
+        yield tail
+
+
+async def agenerate_line_batches(
+        f: Union[IO[AnyStr], asyncio.StreamReader],
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        encoding: Optional[str] = None,
+        executor: Optional[Executor] = None,
+) -> AsyncIterator[List[Union[bytes, str]]]:
+    """
+    Asynchronously generates batches of lines from a file or stream, one batch per block read.
+
+    The asynchronous counterpart of `generate_line_batches` (without offsets). See `agenerate_blocks`. Lines are split
+    on line feeds only, also for text.
+
+    :param f:
+        The opened file (binary or text) or stream from which to generate lines.
+    :param block_size:
+        The number of bytes (or characters) to read at a time. Default value is 1 MiB.
+    :param encoding:
+        If non-null, then the encoding with which to decode each line of a binary file into a `str`.
+    :param executor:
+        The executor within which to read a file. Default value is the event loop's default executor.
+    :return:
+        A lazy asynchronous iterator over lists of lines.
+
+    >>> async def main():
+    ...     process = await asyncio.create_subprocess_exec(
+    ...         'printf', 'a\\nb\\nc', stdout=asyncio.subprocess.PIPE)
+    ...     batches = [batch async for batch in agenerate_line_batches(process.stdout, encoding='ascii')]
+    ...     await process.wait()
+    ...     return batches
+    >>> [line for batch in asyncio.run(main()) for line in batch]
+    ['a\\n', 'b\\n', 'c']
+    """
+    async for block in agenerate_blocks(f, block_size, executor):
+        lines = _split_lines(block)
+        if encoding is not None:
+            lines = [line.decode(encoding) for line in lines]
+        yield lines
+
+
+async def agenerate_lines(
+        f: Union[IO[AnyStr], asyncio.StreamReader],
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        encoding: Optional[str] = None,
+        executor: Optional[Executor] = None,
+) -> AsyncIterator[Union[bytes, str]]:
+    """
+    Asynchronously generates lines from a file or stream.
+
+    The asynchronous counterpart of `generate_lines`. See `agenerate_line_batches`.
+
+    :param f:
+        The opened file (binary or text) or stream from which to generate lines.
+    :param block_size:
+        The number of bytes (or characters) to read at a time. Default value is 1 MiB.
+    :param encoding:
+        If non-null, then the encoding with which to decode each line of a binary file into a `str`.
+    :param executor:
+        The executor within which to read a file. Default value is the event loop's default executor.
+    :return:
+        A lazy asynchronous iterator over lines.
+
+    >>> async def main(f):
+    ...     return [line async for line in agenerate_lines(f, block_size=2)]
+    >>> asyncio.run(main(io.StringIO('one\\ntwo\\n')))
+    ['one\\n', 'two\\n']
+    >>> asyncio.run(main(io.StringIO('a\\rb\\nc\\x0cd\\u2028\\n', newline='')))
+    ['a\\rb\\n', 'c\\x0cd\\u2028\\n']
+    """
+    async for lines in agenerate_line_batches(f, block_size, encoding, executor):
+        for line in lines:
+            yield line
+
+
+def generate_mmap_lines(
+        f: BinaryIO,
+        offsets: bool = False,
+) -> Iterator[Union[memoryview, Tuple[int, memoryview]]]:
+    """
+    Lazily generates lines from a file by memory-mapping it.
+
+    Each line is a `memoryview` into the mapped file, including its line feed (`b'\\n'`), so that no line is copied
+    unless the caller copies it. The file stays mapped until every generated line has been released.
+
+    :param f:
+        The opened binary file from which to generate lines. Must have a file descriptor.
+    :param offsets:
+        Whether to generate each line as a pair of its byte offset and the line itself.
+    :return:
+        A lazy iterator over lines in the file.
+    """
+    size = os.fstat(f.fileno()).st_size
+    if size == 0:  # an empty file cannot be mapped
+        return
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mm)
+    find = mm.find
+    start = 0
+    while start < size:
+        end = find(b'\n', start) + 1 or size
+        if offsets:
+            yield start, view[start:end]
+        else:
+            yield view[start:end]
+        start = end
+
+
+def split_ranges(f: BinaryIO, n: int) -> List[Tuple[int, int]]:
+    """
+    Splits a binary file into line-aligned byte ranges of roughly equal size.
+
+    Every range starts at the start of a line and ends at the end of a line (or of the file), so that each line is
+    within exactly one range.
+
+    :param f:
+        The opened, seekable binary file to split.
+    :param n:
+        The number of ranges into which to split `f`. Fewer ranges are returned if `f` has fewer lines.
+    :return:
+        The non-empty `(start, end)` byte ranges of `f`, in order.
+
+    >>> f = io.BytesIO(b'aaaa\\nb\\nc\\ndddd\\n')
+    >>> split_ranges(f, 3)
+    [(0, 5), (5, 9), (9, 14)]
+    """
+    size = f.seek(0, io.SEEK_END)
+    boundaries = [0]
+    for i in range(1, n):
+        position = max(size * i // n, boundaries[-1])
+        if position >= size:
+            break
+        if position > 0:
+            f.seek(position - 1)
+            f.readline()
+            position = f.tell()
+        if position > boundaries[-1]:
+            boundaries.append(position)
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+
+def _process_range(
+        path: str,
+        start: int,
+        end: int,
+        func: Callable[[Any], Any],
+        batches: bool,
+        encoding: Optional[str],
+        block_size: int,
+) -> List[Any]:
+    with open(path, 'rb') as f:
+        f.seek(start)
+        line_batches = generate_line_batches(f, block_size, encoding, limit=end - start)
+        if batches:
+            return [func(batch) for batch in line_batches]
+        return [func(line) for batch in line_batches for line in batch]
+
+
+def process_ranges(
+        path: str,
+        func: Callable[[Any], Any],
+        n: Optional[int] = None,
+        batches: bool = False,
+        ordered: bool = True,
+        encoding: Optional[str] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        executor: Optional[Executor] = None,
+        range_size: int = DEFAULT_RANGE_SIZE,
+        max_pending: Optional[int] = None,
+) -> Iterator[Any]:
+    """
+    Processes the lines of a file in parallel, one line-aligned byte range per task.
+
+    The file is split by `split_ranges`, and each range is read by `generate_line_batches` and processed within
+    `executor`, so that processing scales with the number of workers. Ranges are many more than workers, so that a
+    slow range delays few others, and at most `max_pending` ranges are submitted (and so their results held in
+    memory) at a time, regardless of the size of the file.
+
+    :param path:
+        The path of the file to process.
+    :param func:
+        The function with which to process each line (or each batch of lines, if `batches`). Must be picklable if
+        `executor` is a process pool, e.g. a module-level function.
+    :param n:
+        The number of ranges into which to split the file. Default value is the number of ranges of `range_size`
+        bytes, but at least the number of CPUs.
+    :param batches:
+        Whether to apply `func` to each batch of lines, as generated by `generate_line_batches`, rather than to each
+        line.
+    :param ordered:
+        Whether to generate results in file order. Otherwise, the results of each range are generated as soon as the
+        range has been processed (of those pending).
+    :param encoding:
+        If non-null, then the encoding with which to decode each line into a `str`. Otherwise, lines are `bytes`.
+    :param block_size:
+        The number of bytes to read at a time. Default value is 1 MiB.
+    :param executor:
+        The executor within which to process each range. Default value is a new `ProcessPoolExecutor` (shut down once
+        all results have been generated).
+    :param range_size:
+        The approximate number of bytes per range, if `n` is null. Default value is 16 MiB.
+    :param max_pending:
+        The maximum number of ranges submitted but not yet generated. Default value is twice the number of CPUs.
+    :return:
+        A lazy iterator over the result of `func` for each line (or batch of lines).
+
+    >>> import tempfile
+    >>> lines = [b'%d\\n' % n for n in range(10_000) if n % 7]
+    >>> with tempfile.NamedTemporaryFile(delete=False) as f:
+    ...     f.writelines(lines)
+    >>> list(process_ranges(f.name, bytes, n=13)) == b''.join(lines).splitlines(keepends=True)
+    True
+    >>> sum(process_ranges(f.name, len, n=13, batches=True, ordered=False, block_size=100, max_pending=3))
+    8571
+    >>> list(process_ranges(f.name, bytes, range_size=1000, max_pending=2)) == list(process_ranges(f.name, bytes))
+    True
+    >>> os.remove(f.name)
+    """
+    n_cpus = os.cpu_count() or 1
+    if n is None:
+        n = max(n_cpus, -(-os.path.getsize(path) // range_size))
+    if max_pending is None:
+        max_pending = 2 * n_cpus
+    with open(path, 'rb') as f:
+        ranges = split_ranges(f, n)
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=min(n_cpus, len(ranges)) or 1)
+    try:
+        # A new range is submitted as each result is generated, so workers never wait for all pending to drain.
+        pending = deque()
+        for start, end in ranges:
+            pending.append(executor.submit(_process_range, path, start, end, func, batches, encoding, block_size))
+            if len(pending) < max_pending:
+                continue
+            if ordered:
+                yield from pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+        yield from chain.from_iterable(future.result() for future in
+                                       (pending if ordered else as_completed(pending)))
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+
+
+def update_line_index(
+        path: str,
+        index_path: Optional[str] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+) -> int:
+    """
+    Builds or incrementally updates the line index file of a text file.
+
+    The index is an array of native unsigned 64-bit integers: the byte offset of the start of each line, followed by
+    the byte offset of the end of the last line. If the file has only been appended to since the index was last
+    updated, then only the appended bytes (and any line that was unterminated) are indexed. If the file has been
+    truncated, then the index is rebuilt. Other rewrites of the file are not detected.
+
+    :param path:
+        The path of the file to index.
+    :param index_path:
+        The path of the index file. Default value is `path` suffixed with `LINE_INDEX_SUFFIX`.
+    :param block_size:
+        The number of bytes to read at a time. Default value is 1 MiB.
+    :return:
+        The number of lines in the file.
+    """
+    if index_path is None:
+        index_path = path + LINE_INDEX_SUFFIX
+    itemsize = array('Q').itemsize
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f, open(index_path, 'a+b') as idx:
+        n_entries = idx.seek(0, io.SEEK_END) // itemsize
+        tail = array('Q')
+        if n_entries >= 2:
+            idx.seek((n_entries - 2) * itemsize)
+            tail.fromfile(idx, 2)
+        if n_entries < 1 or (tail and tail[1] > size):  # new or truncated
+            n_kept, resume = 0, 0
+        elif not tail:  # an index of an empty file
+            n_kept, resume = 1, 0
+        else:
+            f.seek(tail[1] - 1)
+            if f.read(1) == b'\n':  # the last line was terminated
+                n_kept, resume = n_entries, tail[1]
+            else:
+                n_kept, resume = n_entries - 1, tail[0]
+        entries = array('Q', [] if n_kept else [0])
+        f.seek(resume)
+        for offset, block in generate_blocks(f, block_size):
+            offset += resume
+            entries.extend(map(offset.__add__, accumulate(len(part) + 1 for part in block.split(b'\n')[:-1])))
+        if size > (entries[-1] if entries else resume):
+            entries.append(size)
+        idx.truncate(n_kept * itemsize)
+        entries.tofile(idx)
+        return n_kept + len(entries) - 1
+
+
+class LineIndex:
+    """
+    Random access to the lines of a (possibly huge) file by line number, via its line index file.
+
+    The index file is memory-mapped, so that looking up a line is O(1) and does not read the index into memory. Lines
+    are `bytes`, including their line terminators.
+
+    >>> import tempfile
+    >>> with tempfile.NamedTemporaryFile(delete=False) as f:
+    ...     f.writelines([b'zero\\n', b'one\\n', b'two'])
+    >>> with LineIndex(f.name) as index:
+    ...     len(index), index[1], index[-1], index.read_lines(0, 2)
+    (3, b'one\\n', b'two', [b'zero\\n', b'one\\n'])
+    >>> with open(f.name, 'ab') as f_:
+    ...     _ = f_.write(b'\\nthree\\n')
+    >>> with LineIndex(f.name) as index:
+    ...     list(index)
+    [b'zero\\n', b'one\\n', b'two\\n', b'three\\n']
+    >>> os.remove(f.name); os.remove(f.name + LINE_INDEX_SUFFIX)
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None, update: bool = True):
+        """
+        :param path:
+            The path of the indexed file.
+        :param index_path:
+            The path of the index file. Default value is `path` suffixed with `LINE_INDEX_SUFFIX`.
+        :param update:
+            Whether to first build or update the index file, as per `update_line_index`.
+        """
+        if index_path is None:
+            index_path = path + LINE_INDEX_SUFFIX
+        if update:
+            update_line_index(path, index_path)
+        self._file = open(path, 'rb')
+        with open(index_path, 'rb') as idx:
+            self._mmap = mmap.mmap(idx.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = memoryview(self._mmap).cast('Q')
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, n: int) -> bytes:
+        return self.read_line(n)
+
+    def __iter__(self) -> Iterator[bytes]:
+        for n in range(len(self)):
+            yield self.read_line(n)
+
+    def __enter__(self) -> 'LineIndex':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._offsets.release()
+        self._mmap.close()
+        self._file.close()
+
+    def _line_number(self, n: int) -> int:
+        if n < 0:
+            n += len(self)
+        if not 0 <= n < len(self):
+            raise IndexError('line number out of range')
+        return n
+
+    def offset(self, n: int) -> int:
+        """
+        The byte offset of the start of the given line.
+
+        :param n:
+            The (0-based) line number. May be negative, to count from the end.
+        """
+        return self._offsets[self._line_number(n)]
+
+    def read_line(self, n: int) -> bytes:
+        """
+        Reads the given line.
+
+        :param n:
+            The (0-based) line number. May be negative, to count from the end.
+        """
+        n = self._line_number(n)
+        start = self._offsets[n]
+        self._file.seek(start)
+        return self._file.read(self._offsets[n + 1] - start)
+
+    def read_lines(self, start: int, stop: int) -> List[bytes]:
+        """
+        Reads the given range of lines with a single read.
+
+        :param start:
+            The (0-based) line number of the first line to read.
+        :param stop:
+            The (0-based) line number after the last line to read.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start >= stop:
+            return []
+        offsets = self._offsets[start:stop + 1]
+        self._file.seek(offsets[0])
+        data = self._file.read(offsets[-1] - offsets[0])
+        base = offsets[0]
+        return [data[a - base:b - base] for a, b in zip(offsets, offsets[1:])]
+
+    def sample(self, k: int, seed: Optional[int] = None) -> List[bytes]:
+        """
+        Reads a random sample of distinct lines, in file order.
+
+        :param k:
+            The number of lines to sample.
+        :param seed:
+            If non-null, then the seed of the random sample.
+        """
+        return [self.read_line(n) for n in sorted(random.Random(seed).sample(range(len(self)), k))]
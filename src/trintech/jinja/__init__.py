@@ -1,6 +1,6 @@
 from jinja2 import Environment
 
-from rnet93dd.templating import init_custom, create_environment as base_create_environment
+from .templating import init_custom, create_environment as base_create_environment, get_environment as base_get_environment
 
 
 BUILTIN_EXTENSIONS = []
@@ -23,3 +23,8 @@ ENVIRONMENT_SETTINGS = {
 
 def create_environment() -> Environment:
     return base_create_environment(__name__, **ENVIRONMENT_SETTINGS)
+
+
+def get_environment() -> Environment:
+    """The shared (thread-safe) counterpart of `create_environment`."""
+    return base_get_environment(__name__, **ENVIRONMENT_SETTINGS)
@@ -33,7 +33,7 @@ The `RaiseExtension` and `RequireExtensions` herein are taken from
 
 
 
-from jinja2 import nodes
+from jinja2 import Template, nodes
 from jinja2.ext import Extension
 from jinja2.exceptions import TemplateRuntimeError
 
@@ -78,6 +78,25 @@ class RaiseExtension(Extension):
         raise TemplateRuntimeError(msg)
 
 
+REQUIRE_SEEN_KEY = '__require_seen'
+"""The context variable of the set of the templates required so far by a render."""
+
+
+class RequireTemplate(Template):
+    """A template whose every render starts with an empty set of required templates.
+
+    Templates included within it share its context and so its set, except
+    those included "without context", which start their own. A render given
+    `REQUIRE_SEEN_KEY` explicitly uses that set instead, e.g. to require each
+    template only once across several renders.
+    """
+
+    def new_context(self, vars=None, shared=False, locals=None):
+        if not shared and (vars is None or REQUIRE_SEEN_KEY not in vars):
+            vars = dict(vars or (), **{REQUIRE_SEEN_KEY: set()})
+        return super().new_context(vars, shared, locals)
+
+
 class RequireExtension(Extension):
     """ Jinja extension which provides "require" statement.
 
@@ -87,6 +106,24 @@ class RequireExtension(Extension):
     just macros. We use this for code generation where we wish to require
     utility functions, but there are likely other use cases as well.
 
+    Templates are deduplicated per render, at render time, via a set held by
+    the render context (see `RequireTemplate`). Compiled templates therefore
+    do not depend on the order in which they were parsed, may be cached and
+    precompiled, and may be rendered concurrently by many threads.
+
+    Tests:
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> from jinja2 import DictLoader, Environment
+        >>> templates = {'util': 'U', 'a': "{% require 'util' %}a", 'b': "{% require 'util' %}b"}
+        >>> templates.update({f'main{i}': "{% require 'a' %}{% require 'b' %}{% require 'a' %}{% require 'util' %}" for i in range(1000)})
+        >>> env = Environment(loader=DictLoader(templates), extensions=[RequireExtension])
+        >>> with ThreadPoolExecutor(8) as executor:
+        ...     outputs = set(executor.map(lambda i: env.get_template(f'main{i % 1000}').render(), range(4000)))
+        >>> outputs
+        {'Uab'}
+        >>> env.from_string("{% require 'a' %}{% require 'util' %}").render(__require_seen={'util'})
+        'a'
+
     Author:     Dean Serenevy
     Copyright:  Copyright (c) 2013 APCI, LLC
     """
@@ -96,8 +133,11 @@ class RequireExtension(Extension):
 
     def __init__(self, environment):
         super(RequireExtension, self).__init__(environment)
-        # Define the attr we will use
-        environment.extend(require_seen=set())
+        # Give each render its own set of required templates.
+        if not issubclass(environment.template_class, RequireTemplate):
+            environment.template_class = type(
+                'RequireTemplate', (RequireTemplate, environment.template_class), {}
+            )
 
 
     # See also: jinja2.parser.parse_include()
@@ -120,24 +160,25 @@ class RequireExtension(Extension):
         # additional tokens that need to be removed).
         node = parser.parse_import_context(include, True)
 
+        # Only include the template if the render has not yet required it.
+        test = self.call_method(
+            '_require', [nodes.ContextReference(), include.template], lineno=lineno
+        )
+        return nodes.If(test, [node], [], [], lineno=lineno)
+
+    def _require(self, context, template):
+        seen = context.get(REQUIRE_SEEN_KEY)
+        if seen is None:  # e.g. the template class was replaced after registration
+            seen = context.vars[REQUIRE_SEEN_KEY] = set()
         # Ensure the current file is marked as "seen" to avoid loops (to
         # pick up the entry template or any templates included through
         # other means - a bad idea, but may happen).
-        self.environment.require_seen.add(parser.name)
-
-        # However, if we've already seen the template, just return an empty node.
-        name = include.template.as_const()
-        if name in self.environment.require_seen:
-            return nodes.CallBlock(
-                self.call_method('_blank', [], lineno=lineno),
-                [], [], [], lineno=lineno
-            )
-        else:
-            self.environment.require_seen.add(name)
-            return node
-
-    def _blank(self, caller):
-        return ""
+        seen.add(context.name)
+        name = getattr(template, 'name', template)
+        if name in seen:
+            return False
+        seen.add(name)
+        return True
 
 
 
@@ -0,0 +1,332 @@
+"""Utilities for rendering templates in parallel and without holding their whole output in memory."""
+
+
+import os
+import socket
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, TextIO, Tuple, Union
+
+from jinja2 import Environment, Template
+
+from .templating import create_environment
+
+
+BATCH_CHUNK_SIZE = 16
+"""The number of contexts sent to a worker process at a time."""
+
+STREAM_CHUNK_SIZE = 64 * 1024
+"""The minimum number of characters per chunk of streamed output (but the last)."""
+
+
+class RenderTimings(NamedTuple):
+    """The render timings of a template, in seconds, excluding any I/O."""
+    template: str
+    count: int
+    total: float
+    min: float
+    max: float
+    wall: float
+    """The elapsed time of the whole batch, including I/O and inter-process communication."""
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+PathSpec = Union[str, Callable[[int, Any], str]]
+"""Either a format string (given, for a mapping context, its items and `index`, which overrides any item of that name)
+or a callable of `(index, context)`."""
+
+
+_worker_environment: Optional[Environment] = None
+
+
+def _init_worker(template_subpackage: str, settings: Dict[str, Any]) -> None:
+    global _worker_environment
+    _worker_environment = create_environment(template_subpackage, **settings)
+
+
+def _format_path(path: PathSpec, index: int, context: Any) -> str:
+    if callable(path):
+        return path(index, context)
+    if isinstance(context, dict):
+        return path.format_map(dict(context, index=index))
+    return path.format(index=index)
+
+
+def _render_items(
+        template_name: str,
+        items: Iterable[Tuple[int, Any]],
+        path: Optional[PathSpec],
+        encoding: str,
+        env: Optional[Environment]=None,
+) -> Iterator[Tuple[str, float]]:
+    template = (env or _worker_environment).get_template(template_name)
+    for index, context in items:
+        start = time.perf_counter()
+        output = template.render(context)
+        seconds = time.perf_counter() - start
+        if path is not None:
+            output_path = _format_path(path, index, context)
+            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            with open(output_path, 'w', encoding=encoding, newline='') as f:
+                f.write(output)
+            output = output_path
+        yield output, seconds
+
+
+def _render_chunk(
+        template_name: str,
+        items: Iterable[Tuple[int, Any]],
+        path: Optional[PathSpec],
+        encoding: str,
+) -> list:
+    return list(_render_items(template_name, items, path, encoding))
+
+
+def _chunked(iterable: Iterable[Any], size: int) -> Iterator[list]:
+    it = iter(iterable)
+    chunk = list(islice(it, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(it, size))
+
+
+def _generate_pooled(
+        executor: Executor,
+        template_name: str,
+        chunks: Iterable[list],
+        path: Optional[PathSpec],
+        encoding: str,
+        max_pending: int,
+) -> Iterator[list]:
+    # A new chunk is submitted as each result is consumed, so workers never wait for a whole window to drain.
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(_render_chunk, template_name, chunk, path, encoding))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def render_batch(
+        template_subpackage: str,
+        template_name: str,
+        contexts: Iterable[Any],
+        settings: Dict[str, Any]={},
+        f: Optional[TextIO]=None,
+        path: Optional[PathSpec]=None,
+        processes: Optional[int]=None,
+        chunk_size: int=BATCH_CHUNK_SIZE,
+        encoding: str='utf-8',
+        separator: str='',
+) -> RenderTimings:
+    """Renders a template against each of many contexts, across a pool of processes.
+
+    Each worker process builds its own environment, as per
+    `create_environment(template_subpackage, **settings)`, and so compiles each
+    template only once (or not at all, given a shared `bytecode_cache` or
+    `precompiled` bundle in `settings`). Contexts are sent to workers in chunks
+    of `chunk_size`, and at most a few chunks per worker are in flight at a time,
+    so that `contexts` may be a lazy iterable of any length.
+
+    Exactly one of `f` and `path` must be given. Given `f`, the outputs are
+    written to it in the order of `contexts`, each followed by `separator`.
+    Given `path`, each output is written (by its worker) to its own file.
+
+    Args:
+        template_subpackage (str): See `create_environment`.
+        template_name (str): The name of the template to render.
+        contexts (Iterable[Any]): The contexts against which to render, e.g.
+            one dict per table. Must be picklable.
+        settings (Dict[str, Any]): Passed to `create_environment`. Must be
+            picklable, e.g. module-level functions and classes.
+        f (Optional[TextIO]): The file to which to write the combined output.
+        path (Optional[PathSpec]): The path of the file per output, e.g.
+            `'out/{schema}.{table}.sql'` or `'out/{index:05}.sql'`.
+        processes (Optional[int]): The number of worker processes. If `None`,
+            then as per `ProcessPoolExecutor`. If zero, then rendered within
+            this process instead, e.g. for debugging.
+        chunk_size (int): The number of contexts to send to a worker at a time.
+        encoding (str): The encoding of the files per output.
+        separator (str): Written to `f` after each output.
+
+    Returns:
+        RenderTimings: The render timings of the template.
+
+    Examples:
+        >>> import io, sys, tempfile
+        >>> root = tempfile.mkdtemp()
+        >>> os.makedirs(os.path.join(root, 'demo', 'templates'))
+        >>> for name, text in [('__init__.py', ''), ('templates/__init__.py', ''), ('templates/t.sql', 'SELECT {{ n }};')]:
+        ...     with open(os.path.join(root, 'demo', name), 'w') as file:
+        ...         _ = file.write(text)
+        >>> sys.path.insert(0, root)
+        >>> f = io.StringIO()
+        >>> render_batch('demo.templates', 't.sql', ({'n': n} for n in range(3)), f=f, processes=0, separator='\\n').count
+        3
+        >>> f.getvalue()
+        'SELECT 0;\\nSELECT 1;\\nSELECT 2;\\n'
+        >>> f = io.StringIO()
+        >>> render_batch('demo.templates', 't.sql', ({'n': n} for n in range(100)), f=f, processes=2, chunk_size=3).count
+        100
+        >>> f.getvalue() == ''.join(f'SELECT {n};' for n in range(100))
+        True
+        >>> _ = render_batch('demo.templates', 't.sql', [{'n': 7, 'index': 'x'}], path=os.path.join(root, 'out', '{index}-{n}.sql'), processes=2)
+        >>> os.listdir(os.path.join(root, 'out'))
+        ['0-7.sql']
+        >>> sys.path.remove(root)
+
+    """
+    if (f is None) == (path is None):
+        raise ValueError("Exactly one of `f` and `path` must be given.")
+    count, total, min_, max_ = 0, 0.0, float('inf'), 0.0
+    start = time.perf_counter()
+    chunks = _chunked(enumerate(contexts), chunk_size)
+    if processes == 0:
+        env = create_environment(template_subpackage, **settings)
+        results_per_chunk = (_render_items(template_name, chunk, path, encoding, env) for chunk in chunks)
+        executor = None
+    else:
+        processes = processes or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(template_subpackage, settings))
+        results_per_chunk = _generate_pooled(executor, template_name, chunks, path, encoding, 4 * processes)
+    try:
+        for results in results_per_chunk:
+            for output, seconds in results:
+                if f is not None:
+                    f.write(output)
+                    f.write(separator)
+                count += 1
+                total += seconds
+                min_ = min(min_, seconds)
+                max_ = max(max_, seconds)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return RenderTimings(template_name, count, total, min_ if count else 0.0, max_, time.perf_counter() - start)
+
+
+def generate_chunks(
+        template: Template,
+        *args: Any,
+        chunk_size: int=STREAM_CHUNK_SIZE,
+        **kwargs: Any,
+) -> Iterator[str]:
+    """Lazily renders a template in chunks of at least `chunk_size` characters (but the last).
+
+    Unlike `Template.render`, only the current chunk is held in memory, so that
+    memory is constant regardless of the size of the output. Unlike
+    `Template.generate`, which yields one (often tiny) string per template
+    node, chunks are large enough to write efficiently.
+
+    Any custom statements are supported, e.g. `{% require %}` and `{% raise %}`
+    as per `trintech.jinja.extensions`. If the template raises, then the chunks
+    already yielded remain so, i.e. the output is partial.
+
+    Args:
+        template (Template): The template to render.
+        args: Passed to `Template.generate`, as per `Template.render`.
+        chunk_size (int): The minimum number of characters per chunk.
+        kwargs: Passed to `Template.generate`, as per `Template.render`.
+
+    Returns:
+        Iterator[str]: The chunks of the output, in order.
+
+    Examples:
+        >>> template = Environment().from_string('{% for i in range(5) %}{{ i }}{% endfor %}')
+        >>> list(generate_chunks(template, chunk_size=2))
+        ['01', '23', '4']
+
+    """
+    chunk = []
+    length = 0
+    for part in template.generate(*args, **kwargs):
+        chunk.append(part)
+        length += len(part)
+        if length >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+            length = 0
+    if chunk:
+        yield ''.join(chunk)
+
+
+def stream_to_file(
+        template: Template,
+        f: Union[TextIO, BinaryIO],
+        *args: Any,
+        chunk_size: int=STREAM_CHUNK_SIZE,
+        encoding: Optional[str]=None,
+        **kwargs: Any,
+) -> int:
+    """Renders a template straight into a file, chunk by chunk, as per `generate_chunks`.
+
+    Args:
+        template (Template): The template to render.
+        f (Union[TextIO, BinaryIO]): The file to which to write. If binary, then
+            `encoding` must be given.
+        args: See `generate_chunks`.
+        chunk_size (int): See `generate_chunks`.
+        encoding (Optional[str]): The encoding with which to write to a binary
+            file, or `None` for a text file.
+        kwargs: See `generate_chunks`.
+
+    Returns:
+        int: The number of characters written.
+
+    Examples:
+        >>> import io
+        >>> from trintech.jinja.extensions import RaiseExtension
+        >>> env = Environment(extensions=[RaiseExtension])
+        >>> template = env.from_string('{{ x }}{% if not x %}{% raise "x is required" %}{% endif %}')
+        >>> f = io.BytesIO()
+        >>> stream_to_file(template, f, x='é', encoding='utf-8'), f.getvalue()
+        (1, b'\\xc3\\xa9')
+        >>> stream_to_file(template, io.StringIO(), x='')
+        Traceback (most recent call last):
+            ...
+        jinja2.exceptions.TemplateRuntimeError: x is required
+
+    """
+    n_chars = 0
+    for chunk in generate_chunks(template, *args, chunk_size=chunk_size, **kwargs):
+        f.write(chunk if encoding is None else chunk.encode(encoding))
+        n_chars += len(chunk)
+    return n_chars
+
+
+def stream_to_socket(
+        template: Template,
+        sock: socket.socket,
+        *args: Any,
+        chunk_size: int=STREAM_CHUNK_SIZE,
+        encoding: str='utf-8',
+        **kwargs: Any,
+) -> int:
+    """Renders a template straight into a socket, chunk by chunk, as per `generate_chunks`.
+
+    Each chunk is sent in full (as per `socket.sendall`) before the next is rendered.
+
+    Args:
+        template (Template): The template to render.
+        sock (socket.socket): The connected socket to which to send.
+        args: See `generate_chunks`.
+        chunk_size (int): See `generate_chunks`.
+        encoding (str): The encoding with which to send.
+        kwargs: See `generate_chunks`.
+
+    Returns:
+        int: The number of bytes sent.
+
+    """
+    n_bytes = 0
+    for chunk in generate_chunks(template, *args, chunk_size=chunk_size, **kwargs):
+        data = chunk.encode(encoding)
+        sock.sendall(data)
+        n_bytes += len(data)
+    return n_bytes
@@ -1,8 +1,12 @@
+import os
+import threading
+from collections import OrderedDict
 from importlib import import_module
 from itertools import accumulate
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, Hashable, List, NamedTuple, Tuple, Any, Optional
 
-from jinja2 import Environment, PackageLoader
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, ModuleLoader, PackageLoader
+from jinja2.utils import LRUCache
 
 PUNCTUATION_PAIRS: List[Tuple[str, str]] = [
     ('(', ')'),
@@ -29,6 +33,9 @@ PUNCTUATION_PAIRS: List[Tuple[str, str]] = [
 PUNCTUATION_PAIRS_LEFT_TO_RIGHT: Dict[str, str] = {l:r for l,r in PUNCTUATION_PAIRS}
 PUNCTUATION_PAIRS_RIGHT_TO_LEFT: Dict[str, str] = {r:l for l,r in PUNCTUATION_PAIRS}
 
+TEMPLATE_CACHE_SIZE = 400  # as per `jinja2.Environment`
+ENVIRONMENT_CACHE_SIZE = 32
+
 
 
 def get_parent_qualname(qualname: str) -> str:
@@ -81,6 +88,30 @@ def init_custom(
     return safe_import_from(category.upper(), module, default={})
 
 
+def create_bytecode_cache(
+        directory: Optional[str]=None,
+        template_subpackage: Optional[str]=None,
+) -> FileSystemBytecodeCache:
+    """Creates an on-disk cache of compiled templates, shared across processes.
+
+    Each template is cached under its name, and its cached bytecode is reused
+    only while the checksum of its source is unchanged, so that an edited
+    template is recompiled (once) without invalidating the cache by hand.
+
+    Args:
+        directory: The directory in which to cache. If `None`, then the
+            system-wide temporary directory chosen by Jinja2.
+        template_subpackage: If given, then the cache files are namespaced by it,
+            so that several template subpackages may share `directory`.
+    """
+    pattern = '__jinja2_%s.cache'
+    if template_subpackage:
+        pattern = f'__jinja2_{template_subpackage}_%s.cache'
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+    return FileSystemBytecodeCache(directory, pattern)
+
+
 def create_environment(
         template_subpackage: str,
         builtin_extensions: List[str] = [],
@@ -89,19 +120,179 @@ def create_environment(
         globals_: Dict[str, Any] = {},
         policies: Dict[str, Any] = {},
         tests: Dict[str, Any] = {},
+        bytecode_cache: Optional[BytecodeCache] = None,
+        precompiled: Optional[str] = None,
+        cache_size: int = TEMPLATE_CACHE_SIZE,
 ) -> Environment:
-    """Intended to use within "__init__.py" and pass `template_subpackage=__name__`."""
+    """Intended to use within "__init__.py" and pass `template_subpackage=__name__`.
+
+    Templates are loaded from the "templates" directory of the parent package of
+    `template_subpackage`, unless `precompiled` is given, in which case they are
+    loaded (without parsing or compiling) from the directory or zip file written
+    by `compile_templates`. Otherwise, pass a `bytecode_cache` (e.g. as per
+    `create_bytecode_cache`) to compile each template only once across processes.
+
+    At most `cache_size` compiled templates are held in memory, the least
+    recently used being evicted first. The hits and misses of this cache are
+    counted, as per `CountingLRUCache`.
+    """
+    if precompiled is not None:
+        loader = ModuleLoader(precompiled)
+    else:
+        loader = PackageLoader(
+            package_name=get_parent_qualname(template_subpackage),
+            package_path='templates',
+        )
     env = Environment(
-        loader=PackageLoader(
-            package_name='templates',
-            package_path=get_parent_qualname(template_subpackage),
-        ),
+        loader=loader,
         extensions=builtin_extensions,
+        bytecode_cache=bytecode_cache,
+        cache_size=cache_size,
     )
-    for ext in extensions:
+    if cache_size > 0:
+        env.cache = CountingLRUCache(cache_size)
+    for ext in extensions.values():
         env.add_extension(ext)
     env.filters.update(filters)
     env.globals.update(globals_)
     env.policies.update(policies)
     env.tests.update(tests)
     return env
+
+
+def compile_templates(
+        template_subpackage: str,
+        target: str,
+        zip_: Optional[str] = 'deflated',
+        **settings: Any,
+) -> None:
+    """Precompiles every template of a template subpackage into Python modules.
+
+    Intended as a build step, so that `create_environment(template_subpackage,
+    precompiled=target, **settings)` loads templates at import time without
+    parsing or compiling them. The same `settings` (in particular, extensions)
+    must be given to both.
+
+    Args:
+        template_subpackage: As per `create_environment`.
+        target: The path of the zip file, or of the directory, to which to write.
+        zip_: The zip compression ("deflated" or "stored"), or `None` to write a
+            directory of modules instead.
+        settings: Passed to `create_environment`.
+    """
+    env = create_environment(template_subpackage, **settings)
+    env.compile_templates(
+        target,
+        zip=zip_,
+        filter_func=lambda name: not name.endswith(('.py', '.pyc')),
+        ignore_errors=False,
+    )
+
+
+class CacheInfo(NamedTuple):
+    """The statistics of a cache, as per `functools.lru_cache`."""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class CountingLRUCache(LRUCache):
+    """A `jinja2.utils.LRUCache` that counts its hits and misses.
+
+    Intended as the template cache of a `jinja2.Environment`, whose lookups
+    are all via `get`.
+    """
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            rv = self[key]
+        except KeyError:
+            with self._stats_lock:
+                self.misses += 1
+            return default
+        with self._stats_lock:
+            self.hits += 1
+        return rv
+
+    def cache_info(self) -> CacheInfo:
+        with self._stats_lock:
+            return CacheInfo(self.hits, self.misses, self.capacity, len(self))
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(val) for val in value)
+    return value
+
+
+class EnvironmentRegistry:
+    """A thread-safe, bounded cache of environments, per template subpackage and settings.
+
+    Each distinct combination of `create_environment` arguments is built once
+    and then shared, together with its cache of compiled templates, by every
+    thread that asks for it. At most `maxsize` environments are held, the least
+    recently used being evicted first.
+
+    Settings are compared by value (dicts and lists being compared item-wise),
+    so they must be hashable apart from such containers.
+    """
+
+    def __init__(self, maxsize: int = ENVIRONMENT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._environments: 'OrderedDict[Hashable, Environment]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, template_subpackage: str, **settings: Any) -> Environment:
+        """Returns the environment as per `create_environment`, creating it only if need be."""
+        key = (template_subpackage, _freeze(settings))
+        with self._lock:
+            env = self._environments.get(key)
+            if env is not None:
+                self.hits += 1
+                self._environments.move_to_end(key)
+                return env
+            self.misses += 1
+            # Built under the lock, so that racing threads do not build duplicates.
+            env = create_environment(template_subpackage, **settings)
+            self._environments[key] = env
+            if len(self._environments) > self.maxsize:
+                self._environments.popitem(last=False)
+            return env
+
+    def clear(self) -> None:
+        """Removes every environment and resets the statistics."""
+        with self._lock:
+            self._environments.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """The statistics of the environments themselves."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._environments))
+
+    def template_cache_info(self) -> CacheInfo:
+        """The statistics of the compiled templates, summed across the held environments."""
+        with self._lock:
+            infos = [env.cache.cache_info() for env in self._environments.values()
+                     if isinstance(env.cache, CountingLRUCache)]
+        return CacheInfo(*(sum(values) for values in zip(CacheInfo(0, 0, 0, 0), *infos)))
+
+
+ENVIRONMENTS = EnvironmentRegistry()
+
+
+def get_environment(template_subpackage: str, **settings: Any) -> Environment:
+    """Returns the shared environment as per `create_environment`, via `ENVIRONMENTS`."""
+    return ENVIRONMENTS.get(template_subpackage, **settings)
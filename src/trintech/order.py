@@ -1,6 +1,7 @@
 
 
-from typing import Iterable, NewType, Any, Callable, Union, Optional
+from typing import (Iterable, Iterator, NewType, NamedTuple, Any, Callable,
+                    Union, Optional, Dict, List, Tuple)
 
 E = NewType('E', Any)
 
@@ -133,3 +134,183 @@ def contains_strictly_ordered(
         if b_matches(e):
             return it_contains_a and a_matched_on is not e
     return False
+
+
+class OrderQuery(NamedTuple):
+    """A question of whether `a` occurs before `b` within some poset.
+
+    The fields have the same meaning as the like-named arguments of
+    `contains_weakly_ordered` and `contains_strictly_ordered`. A plain `(a, b)`
+    pair may be given wherever an `OrderQuery` is expected.
+
+    """
+    a: Optional[E] = None
+    b: Optional[E] = None
+    a_matches: Optional[Callable[[Optional[E]], bool]] = None
+    b_matches: Optional[Callable[[Optional[E]], bool]] = None
+
+
+def generate_ordered(
+        it: Iterable[Optional[E]],
+        queries: Iterable[Union[OrderQuery, Tuple[Optional[E], Optional[E]]]],
+        strict: bool=False,
+) -> Iterator[Tuple[int, bool]]:
+    """Lazily answers many order queries within a single pass over a poset.
+
+    Each answer is yielded as soon as it is decided, i.e. once the "b" element of
+    its query has been found. Iteration of `it` stops as soon as every query has
+    been answered, so `it` may be a one-shot iterator. Queries whose "b" element
+    never occurs are answered `False` once `it` is exhausted.
+
+    Elements are matched against the `a` and `b` of value queries by hashed
+    lookup, so each element costs O(1) regardless of the number of such
+    queries. Predicates are evaluated only until they first match.
+
+    Args:
+        it (Iterable[Optional[E]]): Assumed to be a partially ordered set
+            ("poset"). May contain `None` as an element.
+        queries (Iterable[Union[OrderQuery, Tuple[Optional[E], Optional[E]]]]):
+            The queries to answer, as `OrderQuery` instances or `(a, b)` pairs.
+        strict (bool): Whether to answer in strict order, as per
+            `contains_strictly_ordered`, rather than in weak order, as per
+            `contains_weakly_ordered`.
+
+    Returns:
+        Iterator[Tuple[int, bool]]: Pairs of the index of a query within
+            `queries` and its answer, in the order in which they are decided.
+
+    Tests:
+        >>> it = iter([3, 2, 1])
+        >>> list(generate_ordered(it, [(3, 2), (1, 3), (2, 4)]))
+        [(1, False), (0, True), (2, False)]
+        >>> it = iter([3, 2, 1, 0])
+        >>> list(generate_ordered(it, [(3, 2)]))
+        [(0, True)]
+        >>> next(it)
+        1
+
+    """
+    queries = [OrderQuery(*query) for query in queries]
+    pending = set(range(len(queries)))
+    a_positions: List[Optional[int]] = [None] * len(queries)
+
+    # Index every endpoint of every query by the element it matches, or else
+    # collect its predicate.
+    value_endpoints: Dict[Optional[E], List[Tuple[int, bool]]] = {}
+    predicate_endpoints: List[Tuple[Callable[[Optional[E]], bool], int, bool]] = []
+    for q, query in enumerate(queries):
+        for value, matches, is_b in ((query.a, query.a_matches, False),
+                                     (query.b, query.b_matches, True)):
+            if matches is None:
+                try:
+                    value_endpoints.setdefault(value, []).append((q, is_b))
+                    continue
+                except TypeError:  # unhashable
+                    matches = lambda other, value=value: value == other
+            predicate_endpoints.append((matches, q, is_b))
+
+    if not pending:
+        return
+    for pos, e in enumerate(it):
+        try:
+            endpoints = value_endpoints.get(e, [])
+        except TypeError:  # unhashable
+            endpoints = []
+        if predicate_endpoints:
+            matched = [(q, is_b) for matches, q, is_b in predicate_endpoints
+                       if q in pending and matches(e)]
+            if matched:
+                # Only the first match of each predicate is ever of interest.
+                endpoints = endpoints + matched
+                predicate_endpoints = [endpoint for endpoint in predicate_endpoints
+                                       if endpoint[1:] not in matched]
+        if not endpoints:
+            continue
+        for q, is_b in endpoints:
+            if not is_b and a_positions[q] is None:
+                a_positions[q] = pos
+        for q, is_b in endpoints:
+            if is_b and q in pending:
+                pending.discard(q)
+                a_pos = a_positions[q]
+                yield q, a_pos is not None and (a_pos < pos if strict else a_pos <= pos)
+        if not pending:
+            return
+    for q in sorted(pending):
+        yield q, False
+
+
+def contains_all_weakly_ordered(
+        it: Iterable[Optional[E]],
+        queries: Iterable[Union[OrderQuery, Tuple[Optional[E], Optional[E]]]],
+) -> List[bool]:
+    """Whether the given poset contains each queried `a` and `b` in weak order.
+
+    Equivalent to calling `contains_weakly_ordered` once per query, but makes
+    only a single pass over `it`. See `generate_ordered`.
+
+    Args:
+        it (Iterable[Optional[E]]): Assumed to be a partially ordered set
+            ("poset"). May contain `None` as an element.
+        queries (Iterable[Union[OrderQuery, Tuple[Optional[E], Optional[E]]]]):
+            The queries to answer, as `OrderQuery` instances or `(a, b)` pairs.
+
+    Returns:
+        List[bool]: The answer to each query, in the order of `queries`.
+
+    Tests:
+        >>> it = [3, 2, 1]
+        >>> contains_all_weakly_ordered(it, [(3, 1), (3, 4), (4, 3), (1, 3), (2, 2)])
+        [True, False, False, False, True]
+        >>> contains_all_weakly_ordered(it, [
+        ...     OrderQuery(a_matches=lambda a: a == 3, b_matches=lambda b: b == 1),
+        ...     OrderQuery(3, b_matches=lambda b: b == 1),
+        ...     OrderQuery(a_matches=lambda a: a == 1, b=3),
+        ... ])
+        [True, True, False]
+
+    """
+    queries = list(queries)
+    answers = [False] * len(queries)
+    for q, answer in generate_ordered(it, queries, strict=False):
+        answers[q] = answer
+    return answers
+
+
+def contains_all_strictly_ordered(
+        it: Iterable[Optional[E]],
+        queries: Iterable[Union[OrderQuery, Tuple[Optional[E], Optional[E]]]],
+) -> List[bool]:
+    """Whether the given poset contains each queried `a` and `b` in strict order.
+
+    Equivalent to calling `contains_strictly_ordered` once per query, but makes
+    only a single pass over `it`. See `generate_ordered`.
+
+    Args:
+        it (Iterable[Optional[E]]): Assumed to be a partially ordered set
+            ("poset"). May contain `None` as an element.
+        queries (Iterable[Union[OrderQuery, Tuple[Optional[E], Optional[E]]]]):
+            The queries to answer, as `OrderQuery` instances or `(a, b)` pairs.
+
+    Returns:
+        List[bool]: The answer to each query, in the order of `queries`.
+
+    Tests:
+        >>> it = [3, 2, 1]
+        >>> contains_all_strictly_ordered(it, [(3, 1), (3, 4), (4, 3), (1, 3), (2, 2)])
+        [True, False, False, False, False]
+        >>> contains_all_strictly_ordered(it, [
+        ...     OrderQuery(a_matches=lambda a: a == 3, b_matches=lambda b: b == 1),
+        ...     OrderQuery(a_matches=lambda a: a == 2, b_matches=lambda b: b == 2),
+        ...     OrderQuery(3, b_matches=lambda b: b == 1),
+        ... ])
+        [True, False, True]
+        >>> contains_all_strictly_ordered([None, [1], 2], [(None, [1]), ([1], 2)])
+        [True, True]
+
+    """
+    queries = list(queries)
+    answers = [False] * len(queries)
+    for q, answer in generate_ordered(it, queries, strict=True):
+        answers[q] = answer
+    return answers
@@ -1,8 +1,57 @@
+from typing import Any, Tuple
+
 import pandas as pd
 
 
+PROFILE_COLUMNS = ['count', 'null_count', 'distinct_count', 'min', 'max', 'memory_usage']
+
+
 def count_na(series: pd.Series) -> int:
     return len(series) - series.count()
 
 
 count_null = count_na  # alias
+
+
+def min_max(series: pd.Series) -> Tuple[Any, Any]:
+    """The minimum and maximum non-null values of a series, or `None` if not comparable."""
+    series = series.dropna()
+    try:
+        return series.min(), series.max()
+    except TypeError:
+        return None, None
+
+
+def profile(df: pd.DataFrame) -> pd.DataFrame:
+    """Profiles every column of a data frame at once.
+
+    Each statistic is computed vectorized over the whole data frame, rather than
+    one series at a time.
+
+    Args:
+        df (pd.DataFrame): The data frame to profile.
+
+    Returns:
+        pd.DataFrame: The `PROFILE_COLUMNS` of each column of `df`, indexed by
+            column: the number of non-null values, of null values and of distinct
+            non-null values, the minimum and maximum non-null values (or `None` if
+            not comparable), and the memory usage in bytes.
+
+    Examples:
+        >>> df = pd.DataFrame({'a': [1, None, 1], 'b': ['x', 'y', None]})
+        >>> profile(df)[['count', 'null_count', 'distinct_count', 'min', 'max']]
+           count  null_count  distinct_count  min  max
+        a      2           1               1  1.0  1.0
+        b      2           1               2    x    y
+
+    """
+    counts = df.count()
+    min_maxes = [min_max(df.iloc[:, i]) for i in range(df.shape[1])]
+    return pd.DataFrame({
+        'count': counts,
+        'null_count': len(df) - counts,
+        'distinct_count': df.nunique(dropna=True),
+        'min': pd.Series([min_ for min_, _ in min_maxes], index=df.columns, dtype=object),
+        'max': pd.Series([max_ for _, max_ in min_maxes], index=df.columns, dtype=object),
+        'memory_usage': df.memory_usage(index=False, deep=True),
+    }, columns=PROFILE_COLUMNS)
@@ -0,0 +1,100 @@
+"""Utilities for ordered categoricals of enum members."""
+
+
+from typing import Optional, Type
+
+import pandas as pd
+
+from trintech.enum import OrderedEnum
+
+
+def enum_dtype(
+        enum_class: Type[OrderedEnum],
+) -> pd.CategoricalDtype:
+    """The ordered categorical dtype of the given ordered enum.
+
+    Args:
+        enum_class (Type[OrderedEnum]): The ordered enum whose members are to be
+            the categories. Aliases are not repeated.
+
+    Returns:
+        pd.CategoricalDtype: An ordered dtype whose categories are the members of
+            `enum_class` in the order defined by `trintech.enum`.
+
+    """
+    return pd.CategoricalDtype(categories=sorted(enum_class), ordered=True)
+
+
+def to_enum_categorical(
+        series: pd.Series,
+        enum_class: Optional[Type[OrderedEnum]]=None,
+) -> pd.Series:
+    """Converts a series of ordered enum members to an ordered categorical.
+
+    Sorting, grouping, comparing, `min` and `max` of the result are performed on
+    the category codes rather than by comparing members one pair at a time.
+
+    Args:
+        series (pd.Series): The series of enum members. May contain nulls.
+        enum_class (Optional[Type[OrderedEnum]]): The ordered enum of the
+            members. If `None`, then inferred from the first non-null member.
+
+    Returns:
+        pd.Series: The ordered categorical form of `series`.
+
+    Raises:
+        ValueError: If `enum_class` is `None` and `series` has no non-null
+            member from which to infer it, or if `series` has a non-null value
+            that is not a member of `enum_class`.
+
+    Examples:
+        >>> from trintech.enum import DefinitionOrderedEnum
+        >>> class Size(DefinitionOrderedEnum):
+        ...     SMALL = 'S'
+        ...     MEDIUM = 'M'
+        ...     LARGE = 'L'
+        >>> s = to_enum_categorical(pd.Series([Size.LARGE, Size.SMALL, None]))
+        >>> s.min(), s.max()
+        (<Size.SMALL: 'S'>, <Size.LARGE: 'L'>)
+        >>> (s > Size.SMALL).tolist()
+        [True, False, False]
+        >>> s.sort_values().tolist()
+        [<Size.SMALL: 'S'>, <Size.LARGE: 'L'>, nan]
+        >>> to_enum_categorical(pd.Series([Size.SMALL, 'M']))
+        Traceback (most recent call last):
+            ...
+        ValueError: Not members of Size: ['M']
+
+    """
+    if enum_class is None:
+        non_null = series.dropna()
+        if non_null.empty:
+            raise ValueError("Cannot infer the enum of a series without members.")
+        enum_class = type(non_null.iloc[0])
+    non_members = series.notna() & ~series.isin(list(enum_class))
+    if non_members.any():
+        raise ValueError(f"Not members of {enum_class.__name__}: {series[non_members].unique().tolist()!r}")
+    return series.astype(enum_dtype(enum_class))
+
+
+def from_enum_categorical(
+        series: pd.Series,
+) -> pd.Series:
+    """Converts an ordered categorical of enum members back to a series of members.
+
+    Args:
+        series (pd.Series): A series as returned by `to_enum_categorical`.
+
+    Returns:
+        pd.Series: The `object` series of the enum members of `series`.
+
+    Examples:
+        >>> from trintech.enum import OrderedEnum
+        >>> class ABC(OrderedEnum):
+        ...     A = 3
+        ...     B = 2
+        >>> from_enum_categorical(to_enum_categorical(pd.Series([ABC.A, ABC.B]))).tolist()
+        [<ABC.A: 3>, <ABC.B: 2>]
+
+    """
+    return series.astype(object)
@@ -1,16 +1,249 @@
-from itertools import count
-from typing import Tuple, Callable, Any, Iterable, Optional
+from concurrent.futures import Executor
+from itertools import repeat
+from typing import Tuple, Callable, Any, Iterable, Iterator, List, Optional
 
-from cytoolz.itertoolz import first
+import numpy as np
 import pandas as pd
 
-from trintech.iter import first_true
+
+CROSS_CHUNK_SIZE = 1_000_000
+CROSS_APPLY_CHUNK_SIZE = 10_000
+
+
+def hash_rows(
+        df: pd.DataFrame,
+        index: bool=False,
+) -> pd.Series:
+    """Hashes each whole row of a data frame to a single 64-bit key.
+
+    Hashing is vectorized column by column, as per `pd.util.hash_pandas_object`.
+    Values of object dtype (including object categories) are hashed by their
+    string representation, so that unequal rows may have equal hashes, e.g.
+    `1` and `'1'`. See `factorize_rows`.
+
+    Args:
+        df (pd.DataFrame): The data frame whose rows to hash.
+        index (bool): Whether to include the index of each row in its hash.
+
+    Returns:
+        pd.Series: The `uint64` hash of each row, with the same index as `df`.
+
+    """
+    return pd.util.hash_pandas_object(df, index=index)
+
+
+def _has_object_values(df: pd.DataFrame, index: bool) -> bool:
+    dtypes = list(df.dtypes)
+    if index:
+        dtypes += [df.index.get_level_values(i).dtype for i in range(df.index.nlevels)]
+    return any(
+        dtype == object or (isinstance(dtype, pd.CategoricalDtype) and dtype.categories.dtype == object)
+        for dtype in dtypes
+    )
+
+
+def _row_columns(df: pd.DataFrame, index: bool) -> List[pd.api.extensions.ExtensionArray]:
+    columns = [df.iloc[:, i].array for i in range(df.shape[1])]
+    if index:
+        columns += [df.index.get_level_values(i).array for i in range(df.index.nlevels)]
+    return columns
+
+
+def _rows_equal(
+        columns: List[pd.api.extensions.ExtensionArray],
+        a: np.ndarray,
+        b: np.ndarray,
+) -> np.ndarray:
+    # Compare column by column, so that only two columns of the compared rows are copied at a time.
+    equal = np.ones(len(a), dtype=bool)
+    for column in columns:
+        a_values = pd.Series(column.take(a), dtype=column.dtype)
+        b_values = pd.Series(column.take(b), dtype=column.dtype)
+        equal &= ((a_values == b_values).fillna(False) | (a_values.isna() & b_values.isna())).to_numpy(dtype=bool)
+    return equal
+
+
+def _factorize_values(
+        columns: List[pd.api.extensions.ExtensionArray],
+        positions: np.ndarray,
+) -> np.ndarray:
+    # Combine the codes of each column pairwise, as per `pd.factorize` (and so `df.drop_duplicates`).
+    codes = np.zeros(len(positions), dtype=np.int64)
+    for column in columns:
+        column_codes, uniques = pd.factorize(column.take(positions), use_na_sentinel=False)
+        codes, _ = pd.factorize(codes * (len(uniques) + 1) + column_codes)
+    return codes
+
+
+def factorize_rows(
+        df: pd.DataFrame,
+        index: bool=False,
+        verify: Optional[bool]=None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Encodes each whole row of a data frame as the code of its distinct row.
+
+    Rows are identified by `hash_rows`, so that only a single 64-bit key per row
+    is ever grouped, regardless of the number of columns. If verified, then
+    rows with equal hashes are compared, and those that are unequal (e.g. `1`
+    and `'1'` in an object column) are split into distinct codes by their
+    values, so that rows are equal exactly as per `df.drop_duplicates()`.
+
+    Args:
+        df (pd.DataFrame): The data frame whose rows to encode.
+        index (bool): Whether to include the index of each row in its identity.
+        verify (Optional[bool]): Whether to verify that rows with equal hashes
+            are equal (with nulls equal to nulls), rather than assume that
+            64-bit hashes never collide. If `None`, then only if any column
+            (or index level, if `index`) has values of object dtype, whose
+            hashes collide systematically (see `hash_rows`).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The code of each row (numbered in order
+            of first occurrence), and the position of the first occurrence of
+            each code.
+
+    Examples:
+        >>> df = pd.DataFrame({'a': [1, 2, 1, None], 'b': ['x', 'y', 'x', None]})
+        >>> codes, firsts = factorize_rows(df, verify=True)
+        >>> codes.tolist(), firsts.tolist()
+        ([0, 1, 0, 2], [0, 1, 3])
+
+    Tests:
+        >>> df = pd.DataFrame({'a': pd.Series([1, '1', 1, True, '1', None], dtype=object)})
+        >>> codes, firsts = factorize_rows(df)
+        >>> codes.tolist(), firsts.tolist()
+        ([0, 1, 0, 0, 1, 2], [0, 1, 5])
+        >>> factorize_rows(df, verify=False)[0].tolist()
+        [0, 0, 0, 0, 0, 1]
+
+    """
+    codes, uniques = pd.factorize(hash_rows(df, index=index).to_numpy(), sort=False)
+    firsts = np.full(len(uniques), len(codes), dtype=np.intp)
+    np.minimum.at(firsts, codes, np.arange(len(codes)))
+    if verify is None:
+        verify = _has_object_values(df, index)
+    if not verify:
+        return codes, firsts
+    # Only rows that are not the first occurrence of their code need be compared.
+    columns = _row_columns(df, index)
+    duplicates = np.flatnonzero(firsts[codes] != np.arange(len(codes)))
+    equal = _rows_equal(columns, firsts[codes[duplicates]], duplicates)
+    if equal.all():
+        return codes, firsts
+    # Split the colliding codes by the values of their rows, and renumber all codes in order of first occurrence.
+    colliding = np.flatnonzero(np.isin(codes, codes[duplicates[~equal]]))
+    splits = np.zeros(len(codes), dtype=np.int64)
+    splits[colliding] = _factorize_values(columns, colliding)
+    codes, _ = pd.factorize(codes * (splits.max() + 1) + splits, sort=False)
+    firsts = np.full(codes.max() + 1, len(codes), dtype=np.intp)
+    np.minimum.at(firsts, codes, np.arange(len(codes)))
+    return codes, firsts
 
 
 def groupby_row(
-        df: pd.Dataframe
+        df: pd.DataFrame,
+        index: bool=True,
+        verify: Optional[bool]=None,
 ) -> pd.core.groupby.DataFrameGroupBy:
-    return df.groupby([*df.index, *df.columns])
+    """Groups a data frame by whole rows.
+
+    The group keys are the codes of `factorize_rows`, numbered in order of first
+    occurrence.
+
+    Args:
+        df (pd.DataFrame): The data frame to group.
+        index (bool): See `factorize_rows`.
+        verify (Optional[bool]): See `factorize_rows`.
+
+    Returns:
+        pd.core.groupby.DataFrameGroupBy: The grouping of equal rows.
+
+    Examples:
+        >>> df = pd.DataFrame({'a': [1, 2, 1]}, index=[0, 0, 0])
+        >>> groupby_row(df).size().tolist()
+        [2, 1]
+
+    """
+    codes, _ = factorize_rows(df, index, verify)
+    return df.groupby(codes, sort=False)
+
+
+def count_rows(
+        df: pd.DataFrame,
+        index: bool=False,
+        verify: Optional[bool]=None,
+) -> pd.Series:
+    """Counts the occurrences of each distinct whole row of a data frame.
+
+    Args:
+        df (pd.DataFrame): The data frame whose rows to count.
+        index (bool): See `factorize_rows`.
+        verify (Optional[bool]): See `factorize_rows`.
+
+    Returns:
+        pd.Series: The number of occurrences of each distinct row, indexed as
+            the first occurrence of each (i.e. as `drop_duplicate_rows(df)`).
+
+    Examples:
+        >>> count_rows(pd.DataFrame({'a': [1, 2, 1]})).tolist()
+        [2, 1]
+
+    """
+    codes, firsts = factorize_rows(df, index, verify)
+    return pd.Series(np.bincount(codes, minlength=len(firsts)), index=df.index[firsts], name='count')
+
+
+def drop_duplicate_rows(
+        df: pd.DataFrame,
+        index: bool=False,
+        verify: Optional[bool]=None,
+) -> pd.DataFrame:
+    """Drops all but the first occurrence of each distinct whole row.
+
+    Equivalent to `df.drop_duplicates()` (or, if `index`, to also comparing the
+    index), but identifies rows by `hash_rows`, as per `factorize_rows`. If
+    `verify` is `False`, then rows with colliding hashes are assumed equal.
+
+    Args:
+        df (pd.DataFrame): The data frame whose duplicate rows to drop.
+        index (bool): See `factorize_rows`.
+        verify (Optional[bool]): See `factorize_rows`.
+
+    Returns:
+        pd.DataFrame: The first occurrence of each distinct row of `df`, in order.
+
+    Examples:
+        >>> drop_duplicate_rows(pd.DataFrame({'a': [1, 2, 1]}))
+           a
+        0  1
+        1  2
+        >>> drop_duplicate_rows(pd.DataFrame({'a': pd.Series([1, '1'], dtype=object)}))
+           a
+        0  1
+        1  1
+
+    """
+    _, firsts = factorize_rows(df, index, verify)
+    return df.iloc[firsts]
+
+
+def _cross_take(
+        a: pd.DataFrame,
+        b: pd.DataFrame,
+        a_positions: np.ndarray,
+        b_positions: np.ndarray,
+        suffixes: Tuple[str, str],
+) -> pd.DataFrame:
+    names = [f'{c}{suffixes[0]}' for c in a.columns] + [f'{c}{suffixes[1]}' for c in b.columns]
+    if len(set(names)) < len(names):
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        raise ValueError(f"The suffixes {suffixes!r} result in duplicate columns: {duplicates!r}")
+    columns = {}
+    for df, positions, suffix in ((a, a_positions, suffixes[0]), (b, b_positions, suffixes[1])):
+        for i, c in enumerate(df.columns):
+            columns[f'{c}{suffix}'] = df.iloc[:, i].array.take(positions)
+    start = int(a_positions[0]) * len(b) + int(b_positions[0]) if len(a_positions) else 0
+    return pd.DataFrame(columns, index=pd.RangeIndex(start, start + len(a_positions)), copy=False)
 
 
 def cross(
@@ -18,25 +251,136 @@ def cross(
         b: pd.DataFrame,
         suffixes: Tuple[str, str]=('_x', '_y'),
 ) -> pd.DataFrame:
-    a2 = a.rename(columns={c: c + suffixes[0] for c in a.columns}, inplace=False)
-    b2 = b.rename(columns={c: c + suffixes[0] for c in b.columns}, inplace=False)
-    key = first_true((f'key_{n}' for n in count()),
-                     lambda k: k not in a.index and k not in b.index)
-    a2[key] = 0
-    b2[key] = 0
-    a2.set_index(key, drop=True, append=True, inplace=True)
-    b2.set_index(key, drop=True, append=True, inplace=True)
-    return pd.merge(a2, b2, on=key, suffixes=('', ''))
+    """Equivalent to `CROSS JOIN` in T-SQL.
+
+    Every column of `a` and of `b` is taken once by position (as per `np.repeat`
+    and `np.tile`), without any join key or intermediate merge.
+
+    Args:
+        a (pd.DataFrame): The left data frame.
+        b (pd.DataFrame): The right data frame.
+        suffixes (Tuple[str, str]): The suffixes with which to rename the columns
+            of `a` and of `b`, respectively. The renamed columns must be
+            distinct.
+
+    Returns:
+        pd.DataFrame: Each row of `a` paired with each row of `b`, in order of
+            `a` and then of `b`, with a `pd.RangeIndex`.
+
+    Raises:
+        ValueError: If the renamed columns are not distinct.
+
+    Examples:
+        >>> cross(pd.DataFrame({'n': [1, 2]}), pd.DataFrame({'n': ['x', 'y']}))
+           n_x n_y
+        0    1   x
+        1    1   y
+        2    2   x
+        3    2   y
+        >>> cross(pd.DataFrame({'k': [1]}), pd.DataFrame({'k': [2]}), suffixes=('', ''))
+        Traceback (most recent call last):
+            ...
+        ValueError: The suffixes ('', '') result in duplicate columns: ['k']
+
+    """
+    a_positions = np.repeat(np.arange(len(a)), len(b))
+    b_positions = np.tile(np.arange(len(b)), len(a))
+    return _cross_take(a, b, a_positions, b_positions, suffixes)
+
+
+def generate_cross(
+        a: pd.DataFrame,
+        b: pd.DataFrame,
+        suffixes: Tuple[str, str]=('_x', '_y'),
+        chunk_size: int=CROSS_CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """Lazily generates `cross(a, b, suffixes)` in chunks of bounded size.
+
+    Args:
+        a (pd.DataFrame): The left data frame.
+        b (pd.DataFrame): The right data frame.
+        suffixes (Tuple[str, str]): See `cross`.
+        chunk_size (int): The maximum number of rows per chunk.
+
+    Returns:
+        Iterator[pd.DataFrame]: Consecutive chunks of `cross(a, b, suffixes)`,
+            each indexed by its positions therein.
+
+    Examples:
+        >>> chunks = generate_cross(pd.DataFrame({'n': [1, 2]}),
+        ...                         pd.DataFrame({'n': ['x', 'y', 'z']}),
+        ...                         chunk_size=2)
+        >>> [chunk.index.tolist() for chunk in chunks]
+        [[0, 1], [2], [3, 4], [5]]
+
+    """
+    if len(a) == 0 or len(b) == 0:
+        return
+    a_step = max(1, chunk_size // len(b))
+    b_step = min(len(b), chunk_size)
+    for a_start in range(0, len(a), a_step):
+        a_range = np.arange(a_start, min(a_start + a_step, len(a)))
+        for b_start in range(0, len(b), b_step):
+            b_range = np.arange(b_start, min(b_start + b_step, len(b)))
+            a_positions = np.repeat(a_range, len(b_range))
+            b_positions = np.tile(b_range, len(a_range))
+            yield _cross_take(a, b, a_positions, b_positions, suffixes)
+
+
+def row_to_frame(
+        idx: Any,
+        row: pd.Series,
+) -> pd.DataFrame:
+    """The single-row data frame of the given row, as yielded by `pd.DataFrame.iterrows`."""
+    return row.to_frame().T
+
+
+def _cross_apply_chunk(
+        df: pd.DataFrame,
+        func: Callable[[Any, pd.Series], pd.DataFrame],
+) -> List[pd.DataFrame]:
+    return [func(idx, row) for idx, row in df.iterrows()]
 
 
 def cross_apply(
         df: pd.DataFrame,
-        func: Callable[[Any, pd.Series], pd.DataFrame]=lambda idx, row: row.to_frame().T,
+        func: Callable[[Any, pd.Series], pd.DataFrame]=row_to_frame,
+        chunk_size: int=CROSS_APPLY_CHUNK_SIZE,
+        executor: Optional[Executor]=None,
 ) -> pd.DataFrame:
     """Equivalent to `CROSS APPLY` in T-SQL.
 
-    Assumes `[*df.index, *df.columns]` constitutes a unique row identifier.
+    Rows are passed to `func` in chunks of `chunk_size` rows. If `executor` is
+    non-null, then the chunks are fanned out to it; otherwise they are processed
+    in turn. Either way, the results are concatenated once, in row order.
+
+    Args:
+        df (pd.DataFrame): The data frame to which to apply `func`.
+        func (Callable[[Any, pd.Series], pd.DataFrame]): The function to apply to
+            the index and row of each row of `df`. Must be picklable if
+            `executor` is a process pool, e.g. a module-level function.
+        chunk_size (int): The number of rows per chunk.
+        executor (Optional[Executor]): The executor within which to process each
+            chunk, e.g. a `ThreadPoolExecutor` or `ProcessPoolExecutor`.
+
+    Returns:
+        pd.DataFrame: The concatenation of the results of `func`.
+
+    Examples:
+        >>> df = pd.DataFrame({'n': [1, 2]}, index=['a', 'b'])
+        >>> cross_apply(df, lambda idx, row: pd.DataFrame({'m': range(row['n'])}, index=[idx] * row['n']))
+           m
+        a  0
+        b  0
+        b  1
 
     """
-    gb = pd.groupby([*df.index, *df.columns])
-    return gb.apply(lambda grp: func(*first(grp.iterrows())))
+    chunks = (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+    if executor is None:
+        results = [_cross_apply_chunk(chunk, func) for chunk in chunks]
+    else:
+        results = list(executor.map(_cross_apply_chunk, chunks, repeat(func)))
+    frames = [frame for result in results for frame in result]
+    if not frames:
+        return df.iloc[:0]
+    return pd.concat(frames)
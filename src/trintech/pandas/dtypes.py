@@ -0,0 +1,210 @@
+"""Utilities for shrinking the memory usage of data frames by their dtypes."""
+
+
+import io
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+MAX_CATEGORY_RATIO = 0.5
+CHUNK_SIZE = 100_000
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = pd.StringDtype('pyarrow')
+except ImportError:
+    STRING_DTYPE = pd.StringDtype()
+
+
+def shrink_column(
+        series: pd.Series,
+        max_category_ratio: float=MAX_CATEGORY_RATIO,
+) -> pd.Series:
+    """Converts a column to the most compact dtype that represents it exactly.
+
+    - Integers are downcast to the smallest (unsigned, if non-negative) integer
+      dtype.
+    - Floats are downcast to `float32` if no value changes.
+    - Object columns of few distinct values (relative to their length) are
+      converted to `category`.
+    - Other object columns of only strings are converted to `STRING_DTYPE`.
+
+    Args:
+        series (pd.Series): The column to shrink.
+        max_category_ratio (float): The maximum ratio of distinct values to
+            values for which to convert to `category`.
+
+    Returns:
+        pd.Series: The shrunk column, or `series` itself if it cannot be shrunk.
+
+    Examples:
+        >>> shrink_column(pd.Series([1, 200])).dtype
+        dtype('uint8')
+        >>> shrink_column(pd.Series([0.5, -1.0])).dtype, shrink_column(pd.Series([0.1])).dtype
+        (dtype('float32'), dtype('float64'))
+        >>> shrink_column(pd.Series(['a', 'b', 'a', 'a'], dtype=object)).dtype.name
+        'category'
+        >>> shrink_column(pd.Series([pd.NA, pd.NA], dtype='Int64')).dtype
+        Int8Dtype()
+        >>> shrink_column(pd.Series([[1], {'a': 2}])).dtype
+        dtype('O')
+
+    """
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return series
+    if pd.api.types.is_integer_dtype(dtype):
+        non_null = series.dropna()
+        if len(non_null) and non_null.min() >= 0:
+            return pd.to_numeric(series, downcast='unsigned')
+        return pd.to_numeric(series, downcast='integer')
+    if pd.api.types.is_float_dtype(dtype) and dtype != np.float32 and isinstance(dtype, np.dtype):
+        shrunk = series.astype(np.float32)
+        if ((shrunk.astype(dtype) == series) | series.isna()).all():
+            return shrunk
+        return series
+    if dtype == object or pd.api.types.is_string_dtype(dtype):
+        non_null = series.dropna()
+        try:
+            n_distinct = non_null.nunique()
+        except TypeError:  # e.g. lists or dicts, which are unhashable
+            return series
+        if len(non_null) and n_distinct <= max_category_ratio * len(non_null):
+            return series.astype('category')
+        if dtype == object and non_null.map(type).eq(str).all():
+            return series.astype(STRING_DTYPE)
+    return series
+
+
+def shrink(
+        df: pd.DataFrame,
+        max_category_ratio: float=MAX_CATEGORY_RATIO,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Converts each column of a data frame as per `shrink_column`.
+
+    Args:
+        df (pd.DataFrame): The data frame to shrink.
+        max_category_ratio (float): See `shrink_column`.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The shrunk data frame, and a report
+            of the dtype and (deep) memory usage in bytes of each column before
+            and after, and the bytes saved.
+
+    Examples:
+        >>> df = pd.DataFrame({'n': [1, 2, 3, 4], 'c': ['x', 'y', 'x', 'x']})
+        >>> shrunk, report = shrink(df)
+        >>> report[['dtype_before', 'dtype_after']]
+          dtype_before dtype_after
+        n        int64       uint8
+        c          str    category
+
+    """
+    shrunk = pd.DataFrame({i: shrink_column(df.iloc[:, i], max_category_ratio)
+                           for i in range(df.shape[1])}, index=df.index)
+    shrunk.columns = df.columns
+    before = df.memory_usage(index=False, deep=True).to_numpy()
+    after = shrunk.memory_usage(index=False, deep=True).to_numpy()
+    report = pd.DataFrame({
+        'dtype_before': df.dtypes.to_numpy(),
+        'dtype_after': shrunk.dtypes.to_numpy(),
+        'bytes_before': before,
+        'bytes_after': after,
+        'bytes_saved': before - after,
+    }, index=df.columns)
+    return shrunk, report
+
+
+def generate_shrunk_chunks(
+        lines: Iterable[str],
+        names: Optional[List[str]]=None,
+        chunk_size: int=CHUNK_SIZE,
+        max_category_ratio: float=MAX_CATEGORY_RATIO,
+        **read_csv_kwargs,
+) -> Iterator[pd.DataFrame]:
+    """Lazily parses CSV lines into shrunk data frames, one chunk of lines at a time.
+
+    Only `chunk_size` lines are ever parsed at once, so that the wide frame of
+    all lines (of `object` columns) is never materialized.
+
+    Args:
+        lines (Iterable[str]): The lines to parse, including line terminators,
+            e.g. as per `trintech.io.generate_lines`.
+        names (Optional[List[str]]): The column names. If `None`, then parsed
+            from the first line.
+        chunk_size (int): The number of lines to parse at a time.
+        max_category_ratio (float): See `shrink_column`.
+        read_csv_kwargs: Passed to `pd.read_csv` for each chunk.
+
+    Returns:
+        Iterator[pd.DataFrame]: The shrunk chunks. Combine with `concat_shrunk`.
+
+    """
+    lines = iter(lines)
+    if names is None:
+        header = next(lines, None)
+        if header is None:
+            return
+        names = list(pd.read_csv(io.StringIO(header), header=None, **read_csv_kwargs).iloc[0].astype(str))
+    chunk = list(islice(lines, chunk_size))
+    while chunk:
+        df = pd.read_csv(io.StringIO(''.join(chunk)), header=None, names=names, **read_csv_kwargs)
+        yield shrink(df, max_category_ratio)[0]
+        chunk = list(islice(lines, chunk_size))
+
+
+def concat_shrunk(
+        frames: Iterable[pd.DataFrame],
+) -> pd.DataFrame:
+    """Concatenates shrunk data frames, keeping categorical columns categorical.
+
+    The categories of a column are unioned across frames, and a column that is
+    categorical in some frames but not others is made categorical in all. If
+    the categories of a column differ in dtype across frames (e.g. numbers in
+    one frame and strings in another), then they are unioned as objects.
+
+    Args:
+        frames (Iterable[pd.DataFrame]): The shrunk data frames, with the same
+            columns, e.g. as per `generate_shrunk_chunks`.
+
+    Returns:
+        pd.DataFrame: The concatenation of `frames`, with a new `pd.RangeIndex`.
+
+    Examples:
+        >>> lines = ['c,n\\n', 'x,1\\n', 'x,2\\n', 'y,300\\n', 'y,4\\n']
+        >>> df = concat_shrunk(generate_shrunk_chunks(lines, chunk_size=2))
+        >>> df['c'].dtype.name, df['n'].dtype.name, df['c'].tolist()
+        ('category', 'uint16', ['x', 'x', 'y', 'y'])
+
+    Tests:
+        >>> lines = ['c,n\\n', ',1\\n', ',2\\n', 'x,3\\n', 'x,4\\n']
+        >>> df = concat_shrunk(generate_shrunk_chunks(lines, chunk_size=2))
+        >>> df['c'].dtype.name, df['c'].tolist()
+        ('category', [nan, nan, 'x', 'x'])
+        >>> lines = ['c\\n', '1\\n', '1\\n', 'x\\n', 'x\\n']
+        >>> concat_shrunk(generate_shrunk_chunks(lines, chunk_size=2))['c'].tolist()
+        [1, 1, 'x', 'x']
+
+    """
+    frames = list(frames)
+    if not frames:
+        return pd.DataFrame()
+    columns = {}
+    for i in range(frames[0].shape[1]):
+        parts = [frame.iloc[:, i] for frame in frames]
+        if any(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            parts = [part.astype('category') for part in parts]
+            if len({part.cat.categories.dtype for part in parts}) > 1:
+                # E.g. a column of codes parsed as numbers in one chunk (or all null, as floats), but not in another.
+                parts = [part.cat.rename_categories(part.cat.categories.astype(object)) for part in parts]
+            categorical = union_categoricals(parts, ignore_order=True)
+            columns[i] = pd.Series(categorical)
+        else:
+            columns[i] = pd.concat(parts, ignore_index=True)
+    df = pd.DataFrame(columns)
+    df.columns = frames[0].columns
+    return df
@@ -1,10 +1,20 @@
 
 
+import re
+import sys
+from itertools import islice
 from typing import *
 
 from trintech.enum import DefinitionOrderedEnum
-from trintech.list import strip
-from trintech.string import quote
+
+
+STRING_QUOTE = '\''
+STRING_ESCAPED_QUOTE = STRING_QUOTE * 2
+IDENTIFIER_LQUOTE = '['
+IDENTIFIER_RQUOTE = ']'
+IDENTIFIER_ESCAPED_RQUOTE = IDENTIFIER_RQUOTE * 2
+
+WRITE_BATCH_SIZE = 10_000
 
 
 def quote_string(
@@ -25,7 +35,7 @@ def quote_string(
         "'my ''quoted'' string'"
 
     """
-    return quote(string, '\'', escape=None)
+    return STRING_QUOTE + string.replace(STRING_QUOTE, STRING_ESCAPED_QUOTE) + STRING_QUOTE
 
 
 def quote_identifier(
@@ -48,7 +58,146 @@ def quote_identifier(
         '[weird[identifier]]]'
 
     """
-    return quote(ident, lquote='[', rquote=']', escape=None)
+    return (IDENTIFIER_LQUOTE
+            + ident.replace(IDENTIFIER_RQUOTE, IDENTIFIER_ESCAPED_RQUOTE)
+            + IDENTIFIER_RQUOTE)
+
+
+def _quote_all(
+        strings: Iterable[str],
+        lquote: str,
+        rquote: str,
+        escaped_rquote: str,
+) -> Sequence[str]:
+    if hasattr(strings, 'str'):  # a `pandas.Series`, so quote vectorized
+        return lquote + strings.str.replace(rquote, escaped_rquote, regex=False) + rquote
+    return [lquote + string.replace(rquote, escaped_rquote) + rquote for string in strings]
+
+
+def _write_all(
+        strings: Iterable[str],
+        quote_all: Callable[[Iterable[str]], List[str]],
+        f: TextIO,
+        sep: str,
+        batch_size: int,
+) -> None:
+    strings = iter(strings)
+    batch = quote_all(islice(strings, batch_size))
+    if batch:
+        f.write(sep.join(batch))
+        batch = quote_all(islice(strings, batch_size))
+    while batch:
+        f.write(sep)
+        f.write(sep.join(batch))
+        batch = quote_all(islice(strings, batch_size))
+
+
+def quote_strings(
+        strings: Iterable[str],
+) -> Sequence[str]:
+    """Quotes many T-SQL string literals.
+
+    Equivalent to applying `quote_string` to each string, but without the
+    per-call overhead. A `pandas.Series` is quoted vectorized.
+
+    Args:
+        strings (Iterable[str]): The string literals to quote, e.g. a list,
+            generator, NumPy array or `pandas.Series`.
+
+    Returns:
+        Sequence[str]: The quoted forms of `strings`, in order.
+            A `pandas.Series` (with the same index, and with nulls kept null) if
+            `strings` is a `pandas.Series`; otherwise a list.
+
+    Examples:
+        >>> quote_strings(['my string', "my 'quoted' string"])
+        ["'my string'", "'my ''quoted'' string'"]
+
+    """
+    return _quote_all(strings, STRING_QUOTE, STRING_QUOTE, STRING_ESCAPED_QUOTE)
+
+
+def quote_identifiers(
+        idents: Iterable[str],
+) -> Sequence[str]:
+    """Quotes many T-SQL identifiers.
+
+    Equivalent to applying `quote_identifier` to each identifier, but without
+    the per-call overhead. A `pandas.Series` is quoted vectorized.
+
+    Args:
+        idents (Iterable[str]): The identifiers to quote, e.g. a list, generator,
+            NumPy array or `pandas.Series`. Assumed to be unqualified and
+            unquoted.
+
+    Returns:
+        Sequence[str]: The quoted forms of `idents`, in order.
+            A `pandas.Series` (with the same index, and with nulls kept null) if
+            `idents` is a `pandas.Series`; otherwise a list.
+
+    Examples:
+        >>> quote_identifiers(['identifier', 'weird[identifier]'])
+        ['[identifier]', '[weird[identifier]]]']
+
+    """
+    return _quote_all(idents, IDENTIFIER_LQUOTE, IDENTIFIER_RQUOTE, IDENTIFIER_ESCAPED_RQUOTE)
+
+
+def write_quoted_strings(
+        strings: Iterable[str],
+        f: TextIO,
+        sep: str=', ',
+        batch_size: int=WRITE_BATCH_SIZE,
+) -> None:
+    """Writes many quoted T-SQL string literals to a text buffer.
+
+    The strings are quoted and written `batch_size` at a time, so that `strings`
+    may be a lazy iterable of any length.
+
+    Args:
+        strings (Iterable[str]): The string literals to quote.
+        f (TextIO): The text buffer to which to write.
+        sep (str): The separator to write between each quoted string.
+        batch_size (int): The maximum number of strings to quote per write.
+
+    Examples:
+        >>> import io
+        >>> f = io.StringIO()
+        >>> write_quoted_strings(iter(['a', "b'c", 'd']), f, batch_size=2)
+        >>> f.getvalue()
+        "'a', 'b''c', 'd'"
+
+    """
+    _write_all(strings, quote_strings, f, sep, batch_size)
+
+
+def write_quoted_identifiers(
+        idents: Iterable[str],
+        f: TextIO,
+        sep: str=', ',
+        batch_size: int=WRITE_BATCH_SIZE,
+) -> None:
+    """Writes many quoted T-SQL identifiers to a text buffer.
+
+    The identifiers are quoted and written `batch_size` at a time, so that
+    `idents` may be a lazy iterable of any length.
+
+    Args:
+        idents (Iterable[str]): The identifiers to quote. Assumed to be
+            unqualified and unquoted.
+        f (TextIO): The text buffer to which to write.
+        sep (str): The separator to write between each quoted identifier.
+        batch_size (int): The maximum number of identifiers to quote per write.
+
+    Examples:
+        >>> import io
+        >>> f = io.StringIO()
+        >>> write_quoted_identifiers(['a', 'b]c'], f)
+        >>> f.getvalue()
+        '[a], [b]]c]'
+
+    """
+    _write_all(idents, quote_identifiers, f, sep, batch_size)
 
 
 def qualify_identifier(
@@ -84,6 +233,13 @@ def qualify_identifier(
     return '.'.join([quote_identifier(part) for part in parts] if quote else parts)
 
 
+def _has_contiguous_parts(
+        parts: Sequence[Optional[str]],
+) -> bool:
+    present = [i for i, part in enumerate(parts) if part is not None]
+    return not present or present[-1] - present[0] + 1 == len(present)
+
+
 class QualifiedIdentifier:
     class Part(DefinitionOrderedEnum):
         SERVER = 'server'
@@ -104,7 +260,7 @@ class QualifiedIdentifier:
                              "part and a non-empty successor part.")
 
     def __iter__(self):
-        return self._server, self._database, self._schema, self._object, self._minor
+        return iter(self.to_tuple())
 
     def to_list(self):
         return [self._server, self._database, self._schema, self._object, self._minor]
@@ -113,9 +269,7 @@ class QualifiedIdentifier:
         return self._server, self._database, self._schema, self._object, self._minor
 
     def _is_valid(self):
-        L = self.to_list()
-        L = strip(L, value=None, inplace=True)
-        return None in L
+        return _has_contiguous_parts(self.to_tuple())
 
     @property
     def server(self):
@@ -206,3 +360,257 @@ class QualifiedIdentifier:
     @minor.deleter
     def minor(self):
         self.minor = None
+
+
+_INTERNED_IDENTIFIERS: Dict[Tuple[str, ...], 'FrozenQualifiedIdentifier'] = {}
+
+
+class FrozenQualifiedIdentifier(tuple):
+    """An immutable, hashable and ordered T-SQL qualified identifier.
+
+    Backed by a tuple of its five parts (without an instance `__dict__`), so it
+    is compact and may be used as a `dict` key or `set` element. An absent part
+    is stored as an empty string (but read as `None`, e.g. by `to_tuple`), so
+    that identifiers are ordered as plain tuples, part by part in the order of
+    `Part`, with an absent part preceding any present part.
+
+    Use `intern` instead of the constructor to share a single instance (and
+    single part strings) among equal identifiers.
+
+    Tests:
+        >>> a = FrozenQualifiedIdentifier(schema='dbo', object='a')
+        >>> b = FrozenQualifiedIdentifier(schema='dbo', object='b')
+        >>> a
+        FrozenQualifiedIdentifier(schema='dbo', object='a')
+        >>> a.object, a.minor
+        ('a', None)
+        >>> a < b, FrozenQualifiedIdentifier(object='z') < a
+        (True, True)
+        >>> a.to_tuple()
+        (None, None, 'dbo', 'a', None)
+        >>> {a: 1}[FrozenQualifiedIdentifier(schema='dbo', object='a')]
+        1
+        >>> a.qualify(quote=True)
+        '[dbo].[a]'
+        >>> FrozenQualifiedIdentifier.intern(object='t') is FrozenQualifiedIdentifier.intern(object='t')
+        True
+        >>> FrozenQualifiedIdentifier(database='db', minor='c')
+        Traceback (most recent call last):
+            ...
+        ValueError: A T-SQL qualified identifier may not have an empty intermediate part with a non-empty predecessor part and a non-empty successor part.
+
+    """
+    __slots__ = ()
+
+    Part = QualifiedIdentifier.Part
+
+    def __new__(cls, server=None, database=None, schema=None, object=None, minor=None):
+        parts = (server or '', database or '', schema or '', object or '', minor or '')
+        if '' in parts and not _has_contiguous_parts([part or None for part in parts]):
+            raise ValueError("A T-SQL qualified identifier may not have an "
+                             "empty intermediate part with a non-empty predecessor "
+                             "part and a non-empty successor part.")
+        return tuple.__new__(cls, parts)
+
+    @classmethod
+    def intern(cls, server=None, database=None, schema=None, object=None, minor=None):
+        """The shared instance of the identifier with the given parts.
+
+        The parts themselves are interned by `sys.intern`, so that the many
+        identifiers of e.g. a single schema share its name.
+
+        """
+        key = (server or '', database or '', schema or '', object or '', minor or '')
+        identifier = _INTERNED_IDENTIFIERS.get(key)
+        if identifier is None:
+            identifier = cls(*(sys.intern(part) for part in key))
+            # Keyed by the identifier itself (equal to `key`), so as not to keep the uninterned parts alive.
+            identifier = _INTERNED_IDENTIFIERS.setdefault(identifier, identifier)
+        return identifier
+
+    @staticmethod
+    def clear_interned() -> None:
+        """Releases all identifiers shared by `intern`."""
+        _INTERNED_IDENTIFIERS.clear()
+
+    def __getnewargs__(self):
+        return self.to_tuple()
+
+    def __repr__(self):
+        fields = ', '.join(f'{part.value}={value!r}'
+                           for part, value in zip(self.Part, self) if value)
+        return f'{type(self).__name__}({fields})'
+
+    server = property(lambda self: self[0] or None)
+    database = property(lambda self: self[1] or None)
+    schema = property(lambda self: self[2] or None)
+    object = property(lambda self: self[3] or None)
+    minor = property(lambda self: self[4] or None)
+
+    def to_list(self):
+        return [part or None for part in self]
+
+    def to_tuple(self):
+        return tuple(part or None for part in self)
+
+    def qualify(self, quote: bool=False) -> str:
+        """The qualified identifier string of the present parts, as per `qualify_identifier`."""
+        return qualify_identifier((part for part in self if part), quote=quote)
+
+
+# A single identifier part, bracket-quoted, double-quoted or unquoted; optional
+# only so that an empty part (e.g. in `db..table`) is matched and then rejected
+# with a clear error, rather than failing to match at all.
+_PART_PATTERN = r'(?:\[((?:[^\]]|\]\])*)\]|"((?:[^"]|"")*)"|([^.\[\]"\s]+))?'
+_SEPARATOR_PATTERN = r'\s*(\.)\s*'
+_PART_COUNT = len(QualifiedIdentifier.Part)
+_PART_INDEXES = {part: i for i, part in enumerate(QualifiedIdentifier.Part)}
+_IDENTIFIER_REGEX = re.compile(
+    r'\s*' + _PART_PATTERN
+    + (r'(?:' + _SEPARATOR_PATTERN + _PART_PATTERN) * (_PART_COUNT - 1)
+    + r')?' * (_PART_COUNT - 1)
+    + r'\s*'
+)
+
+
+def _unquote_part(
+        bracketed: Optional[str],
+        double_quoted: Optional[str],
+        unquoted: Optional[str],
+) -> Optional[str]:
+    if bracketed is not None:
+        part = bracketed.replace(IDENTIFIER_ESCAPED_RQUOTE, IDENTIFIER_RQUOTE)
+    elif double_quoted is not None:
+        part = double_quoted.replace('""', '"')
+    else:
+        return unquoted
+    if not part:
+        raise ValueError("No identifier part may be empty.")
+    return part
+
+
+def parse_identifier(
+        string: str,
+        last: QualifiedIdentifier.Part=QualifiedIdentifier.Part.OBJECT,
+        intern: bool=False,
+) -> FrozenQualifiedIdentifier:
+    """Parses a (possibly qualified and quoted) T-SQL identifier.
+
+    Each part may be unquoted, bracket-quoted (with `]` escaped as `]]`) or
+    double-quoted (with `"` escaped as `""`). The parts are assigned from right
+    to left, starting with `last`.
+
+    Args:
+        string (str): The identifier to parse, e.g. `[srv].[db].dbo.[tbl]`.
+        last (QualifiedIdentifier.Part): The part named by the last part of
+            `string`.
+        intern (bool): Whether to return the shared instance as per
+            `FrozenQualifiedIdentifier.intern`.
+
+    Returns:
+        FrozenQualifiedIdentifier: The unquoted parts of `string`.
+
+    Raises:
+        ValueError: If `string` is not a valid identifier, has an empty part
+            (e.g. `db..table`, as `FrozenQualifiedIdentifier` requires contiguous
+            parts), or has more parts than precede and include `last`.
+
+    Examples:
+        >>> parse_identifier('[srv].[db].dbo.[weird]]name]')
+        FrozenQualifiedIdentifier(server='srv', database='db', schema='dbo', object='weird]name')
+        >>> parse_identifier('dbo."my ""quoted"" table"')
+        FrozenQualifiedIdentifier(schema='dbo', object='my "quoted" table')
+        >>> parse_identifier('[a.b].c', last=QualifiedIdentifier.Part.MINOR)
+        FrozenQualifiedIdentifier(object='a.b', minor='c')
+        >>> parse_identifier('[unterminated')
+        Traceback (most recent call last):
+            ...
+        ValueError: Not a valid T-SQL identifier: '[unterminated'
+        >>> parse_identifier('db..table')
+        Traceback (most recent call last):
+            ...
+        ValueError: No part of a T-SQL identifier may be empty: 'db..table'
+        >>> parse_identifier('a.')
+        Traceback (most recent call last):
+            ...
+        ValueError: No part of a T-SQL identifier may be empty: 'a.'
+        >>> parse_identifier('.a')
+        Traceback (most recent call last):
+            ...
+        ValueError: No part of a T-SQL identifier may be empty: '.a'
+
+    """
+    match = _IDENTIFIER_REGEX.fullmatch(string)
+    if match is None:
+        raise ValueError(f"Not a valid T-SQL identifier: {string!r}")
+    groups = match.groups()
+    parts = [_unquote_part(*groups[0:3])]
+    for i in range(3, len(groups), 4):
+        if groups[i] is None:
+            break
+        parts.append(_unquote_part(*groups[i + 1:i + 4]))
+    if parts[0] is None and len(parts) == 1:
+        raise ValueError("An identifier may not be empty.")
+    if None in parts:
+        raise ValueError(f"No part of a T-SQL identifier may be empty: {string!r}")
+    n_leading = _PART_INDEXES[last] + 1 - len(parts)
+    if n_leading < 0:
+        raise ValueError(f"A T-SQL identifier whose last part is the "
+                         f"{last.value} part may not have more than "
+                         f"{_PART_INDEXES[last] + 1} parts: {string!r}")
+    parts = [None] * n_leading + parts + [None] * (_PART_COUNT - n_leading - len(parts))
+    if intern:
+        return FrozenQualifiedIdentifier.intern(*parts)
+    return FrozenQualifiedIdentifier(*parts)
+
+
+def parse_identifiers(
+        strings: Iterable[str],
+        last: QualifiedIdentifier.Part=QualifiedIdentifier.Part.OBJECT,
+        intern: bool=False,
+) -> Sequence[FrozenQualifiedIdentifier]:
+    """Parses many T-SQL identifiers.
+
+    Equivalent to applying `parse_identifier` to each string, except that each
+    distinct string is parsed only once, so that equal strings share a single
+    identifier even if not interned.
+
+    Args:
+        strings (Iterable[str]): The identifiers to parse, e.g. a list, generator,
+            NumPy array or `pandas.Series`.
+        last (QualifiedIdentifier.Part): See `parse_identifier`.
+        intern (bool): See `parse_identifier`. Interned identifiers are kept
+            for the life of the process (or until
+            `FrozenQualifiedIdentifier.clear_interned`), so prefer not to intern
+            unbounded streams of identifiers, e.g. from logs.
+
+    Returns:
+        Sequence[FrozenQualifiedIdentifier]: The parsed forms of `strings`, in
+            order. A `pandas.Series` (with the same index) if `strings` is a
+            `pandas.Series`; otherwise a list.
+
+    Raises:
+        ValueError: If any string is not a valid identifier.
+
+    Examples:
+        >>> idents = parse_identifiers(['dbo.t', '[dbo].[t]', 'x', 'dbo.t'])
+        >>> idents[0] is idents[3], idents[0] == idents[1]
+        (True, True)
+        >>> idents[2]
+        FrozenQualifiedIdentifier(object='x')
+        >>> idents = parse_identifiers(['dbo.t', '[dbo].[t]'], intern=True)
+        >>> idents[0] is idents[1]
+        True
+
+    """
+    parsed: Dict[str, FrozenQualifiedIdentifier] = {}
+
+    def parse(string: str) -> FrozenQualifiedIdentifier:
+        identifier = parsed.get(string)
+        if identifier is None:
+            identifier = parsed[string] = parse_identifier(string, last, intern)
+        return identifier
+
+    if hasattr(strings, 'map'):  # a `pandas.Series`
+        return strings.map(parse)
+    return [parse(string) for string in strings]
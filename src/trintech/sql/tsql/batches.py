@@ -0,0 +1,115 @@
+"""
+Utilities for splitting T-SQL scripts into batches.
+
+A batch separator is a line consisting of only `GO` (case-insensitively),
+optionally followed by a repeat count and a line comment, as understood by
+`sqlcmd` and SQL Server Management Studio. `GO` within a string literal, quoted
+identifier or comment does not separate batches.
+"""
+
+
+import re
+from typing import Iterable, Iterator, NamedTuple
+
+
+_SEPARATOR_REGEX = re.compile(r'[ \t]*go(?:[ \t]+(\d+))?[ \t]*(?:--.*)?\r?\n?', re.IGNORECASE)
+
+# The tokens that change the lexical state, per state.
+_NORMAL_REGEX = re.compile(r"'|\[|\"|--|/\*")
+_BLOCK_COMMENT_REGEX = re.compile(r'/\*|\*/')
+_CLOSING_QUOTES = {"'": "'", '[': ']', '"': '"'}
+
+
+class Batch(NamedTuple):
+    """A T-SQL batch."""
+    sql: str
+    """The source code of the batch, excluding its separator."""
+    count: int
+    """The number of times that the batch is to be executed, as per `GO count`."""
+    lineno: int
+    """The (1-based) line number of the first line of the batch."""
+
+
+def generate_batches(
+        lines: Iterable[str],
+        skip_empty: bool=True,
+) -> Iterator[Batch]:
+    """Lazily splits the lines of a T-SQL script into batches.
+
+    Only the lines of the current batch are held in memory, so that scripts of
+    any size may be split, e.g. from `trintech.io.generate_lines(f)`.
+
+    Block comments may be nested, as in T-SQL. Quoting follows
+    `trintech.sql.tsql.quote_string` and `trintech.sql.tsql.quote_identifier`:
+    a closing quote is escaped by doubling it.
+
+    Args:
+        lines (Iterable[str]): The lines of the script, each including its line
+            terminator (as when iterating a text file).
+        skip_empty (bool): Whether to skip batches consisting of only
+            whitespace.
+
+    Returns:
+        Iterator[Batch]: The batches of the script, in order.
+
+    Examples:
+        >>> script = '''SELECT 'a
+        ... GO' AS [go
+        ... GO]
+        ... /* /* nested
+        ... GO */
+        ... GO */
+        ... go 2 -- twice
+        ... SELECT 1
+        ... '''
+        >>> for batch in generate_batches(script.splitlines(keepends=True)):
+        ...     print(batch.lineno, batch.count, repr(batch.sql))
+        1 2 "SELECT 'a\\nGO' AS [go\\nGO]\\n/* /* nested\\nGO */\\nGO */\\n"
+        8 1 'SELECT 1\\n'
+
+    """
+    batch = []
+    lineno = 1
+    state = None  # the opening token of the current quote or comment, if any
+    depth = 0  # the nesting depth of block comments
+    for n, line in enumerate(lines, 1):
+        if state is None:
+            separator = _SEPARATOR_REGEX.fullmatch(line)
+            if separator:
+                sql = ''.join(batch)
+                if not skip_empty or sql.strip():
+                    yield Batch(sql, int(separator.group(1) or 1), lineno)
+                batch = []
+                lineno = n + 1
+                continue
+        batch.append(line)
+        pos = 0
+        while True:
+            if state is None:
+                token = _NORMAL_REGEX.search(line, pos)
+                if token is None or token.group() == '--':
+                    break
+                state = token.group()
+                depth = 1
+                pos = token.end()
+            elif state == '/*':
+                token = _BLOCK_COMMENT_REGEX.search(line, pos)
+                if token is None:
+                    break
+                depth += 1 if token.group() == '/*' else -1
+                if depth == 0:
+                    state = None
+                pos = token.end()
+            else:
+                quote = _CLOSING_QUOTES[state]
+                pos = line.find(quote, pos)
+                if pos == -1:
+                    break
+                if line.startswith(quote, pos + 1):  # escaped
+                    pos += 2
+                else:
+                    state = None
+                    pos += 1
+    sql = ''.join(batch)
+    if not skip_empty or sql.strip():
+        yield Batch(sql, 1, lineno)
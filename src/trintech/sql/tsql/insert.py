@@ -0,0 +1,204 @@
+"""
+Utilities for generating T-SQL `INSERT` scripts from `pandas` data frames.
+
+Statements are generated lazily, one batch of rows at a time, so that scripts
+of any size may be streamed to a file without being held in memory.
+"""
+
+
+from itertools import chain
+from typing import Iterable, Iterator, Optional, TextIO, Union
+
+import numpy as np
+import pandas as pd
+
+from trintech.sql.tsql import quote_identifiers, quote_strings, qualify_identifier
+
+
+MAX_VALUES_ROWS = 1000
+"""The maximum number of rows that SQL Server allows in a `VALUES` clause."""
+
+RENDER_BATCHES = 100
+"""The number of statements' worth of rows to render as values at a time."""
+
+NULL = 'NULL'
+
+
+def render_column(
+        series: pd.Series,
+) -> pd.Series:
+    """Renders each value of a column as a T-SQL literal.
+
+    Rendering is vectorized by dtype:
+
+    - booleans are rendered as `1` or `0`;
+    - numbers are rendered as numeric literals;
+    - datetimes are rendered as ISO 8601 string literals, suitable for
+      `datetime2` columns (or, if time zone -aware, `datetimeoffset` columns in
+      UTC);
+    - all else is rendered as a Unicode string literal of its `str` form.
+
+    Nulls are rendered as `NULL`.
+
+    Args:
+        series (pd.Series): The column to render.
+
+    Returns:
+        pd.Series: The rendered literals, with the same index as `series`.
+
+    Raises:
+        ValueError: If `series` contains an infinite number, which T-SQL cannot
+            represent.
+
+    Examples:
+        >>> render_column(pd.Series([1.5, None])).tolist()
+        ['1.5', 'NULL']
+        >>> render_column(pd.Series([True, False])).tolist()
+        ['1', '0']
+        >>> render_column(pd.Series(["it's", None])).tolist()
+        ["N'it''s'", 'NULL']
+        >>> render_column(pd.Series(pd.to_datetime(['2018-01-02 03:04:05']))).tolist()
+        ["'2018-01-02T03:04:05.000000'"]
+
+    """
+    nulls = series.isna()
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        rendered = series.map({True: '1', False: '0'})
+    elif pd.api.types.is_numeric_dtype(dtype):
+        if pd.api.types.is_float_dtype(dtype) and np.isinf(series.to_numpy(dtype=float)).any():
+            raise ValueError("T-SQL cannot represent an infinite number.")
+        rendered = series.astype(str)
+    elif isinstance(dtype, pd.DatetimeTZDtype):
+        rendered = quote_strings(series.dt.tz_convert('UTC').dt.strftime('%Y-%m-%dT%H:%M:%S.%fZ'))
+    elif pd.api.types.is_datetime64_dtype(dtype):
+        rendered = quote_strings(series.dt.strftime('%Y-%m-%dT%H:%M:%S.%f'))
+    else:
+        rendered = 'N' + quote_strings(series.astype(object).where(~nulls, '').astype(str))
+    return rendered.astype(object).where(~nulls, NULL)
+
+
+def render_rows(
+        df: pd.DataFrame,
+) -> pd.Series:
+    """Renders each row of a data frame as a T-SQL row value constructor.
+
+    Args:
+        df (pd.DataFrame): The rows to render. Must have at least one column.
+
+    Returns:
+        pd.Series: The rendered row value constructors, e.g. `(1, N'a')`, with
+            the same index as `df`.
+
+    Examples:
+        >>> render_rows(pd.DataFrame({'a': [1, 2], 'b': ['x', None]})).tolist()
+        ["(1, N'x')", '(2, NULL)']
+
+    """
+    columns = [render_column(df.iloc[:, i]) for i in range(df.shape[1])]
+    rendered = columns[0]
+    for column in columns[1:]:
+        rendered = rendered + ', ' + column
+    return '(' + rendered + ')'
+
+
+def generate_insert_statements(
+        table: Union[str, Iterable[str]],
+        frames: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        batch_size: int=MAX_VALUES_ROWS,
+        terminator: str=';\n',
+) -> Iterator[str]:
+    """Lazily generates batched T-SQL `INSERT ... VALUES` statements.
+
+    Each statement inserts at most `batch_size` rows. Only `RENDER_BATCHES`
+    statements' worth of rows are rendered at a time, regardless of the size of
+    each data frame.
+
+    Args:
+        table (Union[str, Iterable[str]]): The unquoted name, or the unquoted
+            parts (in order) of the qualified name, of the table into which to
+            insert. Quoted as per `qualify_identifier`.
+        frames (Union[pd.DataFrame, Iterable[pd.DataFrame]]): The rows to
+            insert, either as a single data frame or as an iterable of data frame
+            chunks (e.g. as read by `pd.read_csv(..., chunksize=...)`). The
+            columns of each are the columns into which to insert.
+        batch_size (int): The maximum number of rows per statement. At most
+            `MAX_VALUES_ROWS`.
+        terminator (str): The string with which to terminate each statement.
+
+    Returns:
+        Iterator[str]: The statements, in row order.
+
+    Raises:
+        ValueError: If `batch_size` is not within `[1, MAX_VALUES_ROWS]`.
+
+    Examples:
+        >>> df = pd.DataFrame({'id': [1, 2, 3], 'name': ['a', "b'c", None]})
+        >>> for stmt in generate_insert_statements(['dbo', 'My Table'], df, batch_size=2):
+        ...     print(stmt, end='')
+        INSERT INTO [dbo].[My Table] ([id], [name]) VALUES
+        (1, N'a'),
+        (2, N'b''c');
+        INSERT INTO [dbo].[My Table] ([id], [name]) VALUES
+        (3, NULL);
+
+    """
+    if not 1 <= batch_size <= MAX_VALUES_ROWS:
+        raise ValueError(f"The batch size must be within [1, {MAX_VALUES_ROWS}].")
+    if isinstance(table, str):
+        table = [table]
+    table = qualify_identifier(table, quote=True)
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+    render_size = batch_size * RENDER_BATCHES
+    for df in frames:
+        if df.empty:
+            continue
+        header = f'INSERT INTO {table} ({", ".join(quote_identifiers(map(str, df.columns)))}) VALUES\n'
+        for render_start in range(0, len(df), render_size):
+            rows = render_rows(df.iloc[render_start:render_start + render_size]).tolist()
+            for start in range(0, len(rows), batch_size):
+                yield header + ',\n'.join(rows[start:start + batch_size]) + terminator
+
+
+def write_insert_script(
+        f: TextIO,
+        table: Union[str, Iterable[str]],
+        frames: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        batch_size: int=MAX_VALUES_ROWS,
+        terminator: str=';\n',
+        separator: Optional[str]=None,
+) -> None:
+    """Writes batched T-SQL `INSERT ... VALUES` statements to a file.
+
+    Statements are written as they are generated by `generate_insert_statements`,
+    so memory use is bounded regardless of the number of rows.
+
+    Args:
+        f (TextIO): The opened file to which to write.
+        table (Union[str, Iterable[str]]): See `generate_insert_statements`.
+        frames (Union[pd.DataFrame, Iterable[pd.DataFrame]]): See
+            `generate_insert_statements`.
+        batch_size (int): See `generate_insert_statements`.
+        terminator (str): See `generate_insert_statements`.
+        separator (Optional[str]): If non-null, then written after each
+            statement, e.g. `'GO\\n'`.
+
+    Examples:
+        >>> import io
+        >>> f = io.StringIO()
+        >>> chunks = (pd.DataFrame({'x': [n]}) for n in range(2))
+        >>> write_insert_script(f, 'T', chunks, separator='GO\\n')
+        >>> print(f.getvalue(), end='')
+        INSERT INTO [T] ([x]) VALUES
+        (0);
+        GO
+        INSERT INTO [T] ([x]) VALUES
+        (1);
+        GO
+
+    """
+    statements = generate_insert_statements(table, frames, batch_size, terminator)
+    if separator is not None:
+        statements = chain.from_iterable((statement, separator) for statement in statements)
+    f.writelines(statements)